@@ -0,0 +1,104 @@
+from utils.pace import PACE_COLUMNS, compute_pace
+
+# Target/actual columns rolled up at every level
+SUM_COLUMNS = ['SalesValTarget', 'TotalSalesVal', 'RealAppsTarget', 'TotalRealAppsVol']
+
+# A team is one supervisor's consultants (processors merging several sheets add e.g. region)
+TEAM_KEY_COLUMNS = ['Supervisor Name']
+
+TEAM_SUMMARY_COLUMNS = [
+    'team_name', 'SalesValTarget', 'TotalSalesVal', 'RealAppsTarget', 'TotalRealAppsVol',
+    'avg_performance', 'team_size', 'team_sales_achievement', 'team_apps_achievement'
+] + PACE_COLUMNS
+
+
+class AggregationCube:
+    """Consultant -> supervisor -> race -> company totals from one grouped pass.
+
+    Built from a processed frame (in performance order); every summary the
+    dashboard needs is then derived from the small per-supervisor table.
+    Team pace against the month's business-day `calendar` (a pace.MonthCalendar,
+    the current month by default) is computed here once for all teams. Teams
+    are keyed by `team_columns`; key columns besides the supervisor are
+    kept as columns of the team summaries.
+    """
+
+    def __init__(self, processed_data, calendar=None, team_columns=TEAM_KEY_COLUMNS):
+        self.source = processed_data
+        self.calendar = calendar
+        self.team_columns = list(team_columns)
+
+        # The only full-table scan: one groupby over consultants, reduced with plain
+        # sum/first/max/count (named aggregations cost more than the reductions themselves)
+        grouped = processed_data.groupby(self.team_columns, observed=True, sort=True)
+        # Rows are in performance order, so the first consultant is the team's best
+        first = grouped[['race', 'Consultant Name']].first()
+        teams = grouped[SUM_COLUMNS + ['overall_performance']].sum().rename(
+            columns={'overall_performance': 'performance_sum'}
+        )
+        teams.insert(0, 'race', first['race'])
+        teams['team_size'] = grouped['Consultant Name'].count()
+        teams['top_performance'] = grouped['overall_performance'].max()
+        teams['top_performer'] = first['Consultant Name']
+        # Names may be categorical in the processed frame; summaries use plain strings
+        teams = teams.rename(index=str)
+        teams['top_performer'] = teams['top_performer'].astype(str)
+        teams = teams.join(compute_pace(teams['SalesValTarget'], teams['TotalSalesVal'], calendar))
+        self.teams = teams
+
+        # Race and company levels roll up from the supervisor table
+        self.races = teams.groupby('race', observed=True)[SUM_COLUMNS + ['performance_sum', 'team_size']].sum()
+        self.company = teams[SUM_COLUMNS + ['performance_sum', 'team_size']].sum()
+
+        self._team_summaries = {}
+        self._company_metrics = None
+
+    def team_summary(self, race_name=None, sort_by=None):
+        """Team-level summary for all teams (or one race), alphabetical or sorted descending by a column"""
+        key = (race_name, sort_by)
+        if key not in self._team_summaries:
+            team_summary = self._build_team_summary(race_name)
+            if sort_by is not None:
+                team_summary = team_summary.sort_values(sort_by, ascending=False)
+            self._team_summaries[key] = team_summary
+        return self._team_summaries[key]
+
+    def _build_team_summary(self, race_name):
+        teams = self.teams
+        if race_name is not None:
+            teams = teams[teams['race'] == race_name]
+
+        team_summary = teams.reset_index().rename(columns={'Supervisor Name': 'team_name'})
+        key_columns = [col for col in self.team_columns if col != 'Supervisor Name']
+        team_summary['avg_performance'] = team_summary['performance_sum'] / team_summary['team_size']
+
+        # Calculate team achievement rates
+        team_summary['team_sales_achievement'] = (
+            team_summary['TotalSalesVal'] / team_summary['SalesValTarget'] * 100
+        ).fillna(0)
+
+        team_summary['team_apps_achievement'] = (
+            team_summary['TotalRealAppsVol'] / team_summary['RealAppsTarget'] * 100
+        ).fillna(0)
+
+        return team_summary[TEAM_SUMMARY_COLUMNS[:1] + key_columns + TEAM_SUMMARY_COLUMNS[1:]]
+
+    def company_metrics(self):
+        """Company-wide metrics for the total gauge"""
+        if self._company_metrics is None:
+            company = self.company
+            team_count = len(self.teams)
+            top_team = self.teams['top_performance'].idxmax() if team_count else None
+
+            self._company_metrics = {
+                'total_sales_target': company['SalesValTarget'],
+                'total_sales_actual': company['TotalSalesVal'],
+                'total_apps_target': company['RealAppsTarget'],
+                'total_apps_actual': company['TotalRealAppsVol'],
+                'overall_sales_achievement': (company['TotalSalesVal'] / company['SalesValTarget'] * 100) if company['SalesValTarget'] > 0 else 0,
+                'overall_apps_achievement': (company['TotalRealAppsVol'] / company['RealAppsTarget'] * 100) if company['RealAppsTarget'] > 0 else 0,
+                'avg_individual_performance': company['performance_sum'] / company['team_size'] if team_count else float('nan'),
+                'total_consultants': int(company['team_size']),
+                'top_performer': self.teams.loc[top_team, 'top_performer'] if team_count else 'N/A'
+            }
+        return self._company_metrics
@@ -0,0 +1,375 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from utils.change_feed import RESYNC, ChangeFeed, diff_positions, snapshot_positions
+from utils.history_store import HistoryStore
+from utils.instrumentation import PROMETHEUS_CONTENT_TYPE, Instrumentation, LogSink
+from utils.racing_data_processor import RacingDataProcessor
+from utils.workbook_cache import workbook_fingerprint
+from utils.workbook_watcher import WorkbookWatcher
+
+# Workbook served when the app is started with `uvicorn utils.api_server:app`
+WORKBOOK_ENV_VAR = 'RACING_WORKBOOK'
+# When set, every processed snapshot is recorded as that day's history in this SQLite file
+HISTORY_ENV_VAR = 'RACING_HISTORY_DB'
+# Set to 1 to report per-stage peak allocations (tracemalloc slows processing down)
+TRACE_MEMORY_ENV_VAR = 'RACING_TRACE_MEMORY'
+# Stage timings and cache counters for Prometheus to scrape
+METRICS_PATH = '/metrics'
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 1000
+
+# SSE keep-alive interval
+HEARTBEAT_SECONDS = 15
+
+# A processed snapshot together with the content hash of the workbook it was built from
+LoadedWorkbook = namedtuple('LoadedWorkbook', ['snapshot', 'content_hash'])
+
+
+class ApiError(Exception):
+    """Error returned to the client as a JSON body with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    """Make numpy scalars JSON serializable"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode_json(payload):
+    return json.dumps(payload, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+def _encode_frame(df, fmt):
+    """Encode a DataFrame as compact JSON records or an Arrow IPC stream"""
+    if fmt == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ApiError(406, "Arrow output needs pyarrow installed")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), 'application/vnd.apache.arrow.stream'
+    return df.to_json(orient='records', force_ascii=False).encode('utf-8'), 'application/json'
+
+
+def _param(params, name, default=None):
+    values = params.get(name)
+    return values[0] if values else default
+
+
+def _top_n(params):
+    try:
+        top_n = int(_param(params, 'top_n', DEFAULT_TOP_N))
+    except ValueError:
+        raise ApiError(400, "top_n must be an integer")
+    return max(1, min(top_n, MAX_TOP_N))
+
+
+def _race(snapshot, params):
+    race_name = _param(params, 'race')
+    if race_name is not None and race_name not in snapshot.race_registry.races:
+        raise ApiError(404, f"Unknown race '{race_name}'")
+    return race_name
+
+
+def races_view(snapshot, params, fmt):
+    return _encode_json({'races': snapshot.get_race_teams_split()}), 'application/json'
+
+
+def company_view(snapshot, params, fmt):
+    return _encode_json(snapshot.get_total_company_metrics()), 'application/json'
+
+
+def teams_view(snapshot, params, fmt):
+    race_name = _race(snapshot, params)
+    if race_name is None:
+        return _encode_frame(snapshot.get_team_summary(), fmt)
+    return _encode_frame(snapshot.get_team_summary_by_race(race_name), fmt)
+
+
+def leaderboard_view(snapshot, params, fmt):
+    race_name = _race(snapshot, params)
+    rank_method = _param(params, 'rank', 'ordinal')
+    try:
+        if race_name is None:
+            leaders = snapshot.get_racing_leaderboard(_top_n(params), rank_method=rank_method)
+        else:
+            leaders = snapshot.get_racing_leaderboard_by_race(race_name, _top_n(params), rank_method=rank_method)
+    except ValueError as e:
+        raise ApiError(400, str(e))
+    return _encode_frame(leaders, fmt)
+
+
+ROUTES = {
+    '/api/races': races_view,
+    '/api/company': company_view,
+    '/api/teams': teams_view,
+    '/api/leaderboard': leaderboard_view,
+}
+
+
+class RacingApi:
+    """Headless ASGI app serving RacingDataProcessor outputs as JSON or Arrow.
+
+    Responses carry an ETag derived from the workbook content hash, the data
+    version and the request, so pollers get a body-less 304 until data changes.
+    Clients of /api/stream instead get position deltas pushed over SSE as soon
+    as the workbook changes, reprocessed once no matter how many are connected.
+    Reloads run on the watcher thread and are swapped in as one reference, and
+    each request reads a single immutable snapshot, so requests never wait for
+    a reload or see a half-processed workbook. Every processing stage and
+    getter is timed; /metrics exposes the totals and each span is logged as
+    JSON on the racing.instrumentation logger.
+    """
+
+    def __init__(self, excel_file_path=None, history_path=None, instrumentation=None):
+        self.excel_file_path = excel_file_path or os.environ.get(WORKBOOK_ENV_VAR)
+        history_path = history_path or os.environ.get(HISTORY_ENV_VAR)
+        self.history = HistoryStore(history_path) if history_path else None
+        self.history_error = None
+        self.processor = None
+        self.loaded = None
+        self._load_lock = threading.Lock()
+        # Encoded bodies for the current data version, keyed by path + query
+        self._responses = {}
+        self.change_feed = ChangeFeed()
+        self._watcher = None
+        self.instrumentation = instrumentation or Instrumentation(
+            [LogSink()], trace_memory=os.environ.get(TRACE_MEMORY_ENV_VAR) == '1'
+        )
+
+    def get_loaded(self):
+        """The current snapshot and workbook hash; only the very first call waits for processing"""
+        loaded = self.loaded
+        if loaded is not None:
+            if self.processor.current_snapshot() is not loaded.snapshot:
+                loaded = self.roll_over()
+            return loaded
+        if not self.excel_file_path:
+            raise ApiError(503, f"No workbook configured; set {WORKBOOK_ENV_VAR}")
+
+        with self._load_lock:
+            if self.loaded is None:
+                fingerprint = workbook_fingerprint(self.excel_file_path)
+                self.processor = RacingDataProcessor(self.excel_file_path, instrumentation=self.instrumentation)
+                self.loaded = LoadedWorkbook(self.processor.current_snapshot(), fingerprint.content_hash)
+                self.record_history(self.loaded.snapshot)
+        self.start_watching()
+        return self.loaded
+
+    def roll_over(self):
+        """Swap in the snapshot the processor republished for a new day (same workbook, current pace)"""
+        with self._load_lock:
+            current = self.loaded
+            snapshot = self.processor.current_snapshot()
+            if snapshot is current.snapshot:
+                return current
+            self.loaded = current._replace(snapshot=snapshot)
+        # Positions don't move overnight, but subscribers follow the version chain
+        self.publish_changes(current.snapshot, snapshot)
+        self.record_history(snapshot)
+        return self.loaded
+
+    def reload(self):
+        """Reprocess a changed workbook and swap its snapshot in (runs on the watcher thread)"""
+        with self._load_lock:
+            current = self.loaded
+            fingerprint = workbook_fingerprint(self.excel_file_path)
+            if current is None or fingerprint.content_hash == current.content_hash:
+                return fingerprint.content_hash
+
+            # Incremental refreshes place changed rows exactly as a full run would, ties included
+            # (tests/test_api_server.py compares the two), at about half the cost on large sheets
+            self.processor.refresh(incremental=True)
+            snapshot = self.processor.current_snapshot()
+            self.loaded = LoadedWorkbook(snapshot, fingerprint.content_hash)
+
+        if snapshot is not current.snapshot:
+            self.publish_changes(current.snapshot, snapshot)
+            self.record_history(snapshot)
+        return fingerprint.content_hash
+
+    def record_history(self, snapshot):
+        """Record a snapshot as the history of its snapshot date, if a history store is configured"""
+        if self.history is None:
+            return
+        try:
+            self.history.record_snapshot(snapshot)
+            self.history_error = None
+        except Exception as e:
+            # History is best effort; serving the current data must not depend on it
+            self.history_error = e
+
+    def publish_changes(self, previous, snapshot):
+        """Push the position/achievement deltas of a reload to stream subscribers.
+
+        Each event names the version it applies to, so a client can tell it
+        has every delta since the version it last saw.
+        """
+        event = {
+            'data_version': snapshot.version,
+            'previous_version': previous.version,
+            **diff_positions(previous.processed_data, snapshot.processed_data, self.processor.row_key_columns),
+        }
+        self.change_feed.publish(event)
+
+    def start_watching(self):
+        """Reload the workbook in the background whenever it is rewritten"""
+        if self._watcher is None and self.excel_file_path:
+            self._watcher = WorkbookWatcher(self.excel_file_path, self.reload).start()
+
+    def etag(self, loaded, path, query_string):
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(f"{loaded.content_hash}:{loaded.snapshot.version}:{path}?{query_string}".encode('utf-8'))
+        return f'"{digest.hexdigest()}"'
+
+    def handle(self, path, query_string, if_none_match):
+        """Resolve a GET request to (status, headers, body); runs on a worker thread"""
+        if path == METRICS_PATH:
+            body = self.instrumentation.prometheus_text().encode('utf-8')
+            return 200, [(b'content-type', PROMETHEUS_CONTENT_TYPE.encode('ascii'))], body
+
+        view = ROUTES.get(path)
+        if view is None:
+            raise ApiError(404, f"Unknown endpoint {path}")
+
+        loaded = self.get_loaded()
+        etag = self.etag(loaded, path, query_string)
+        headers = [(b'etag', etag.encode('ascii')), (b'cache-control', b'no-cache')]
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return 304, headers, b''
+
+        cached = self._responses.get(etag)
+        if cached is None:
+            params = parse_qs(query_string)
+            cached = view(loaded.snapshot, params, _param(params, 'format', 'json'))
+            if len(self._responses) > 256:
+                self._responses.clear()
+            self._responses[etag] = cached
+
+        body, content_type = cached
+        return 200, headers + [(b'content-type', content_type.encode('ascii'))], body
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+
+        if scope['type'] != 'http':
+            return
+
+        if scope['path'] == '/api/stream':
+            await self.stream(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get('headers') or [])
+        if_none_match = request_headers.get(b'if-none-match', b'').decode('latin-1')
+        try:
+            if scope['method'] not in ('GET', 'HEAD'):
+                raise ApiError(405, "Only GET is supported")
+            status, headers, body = await asyncio.to_thread(
+                self.handle, scope['path'], scope.get('query_string', b'').decode('latin-1'), if_none_match
+            )
+        except ApiError as e:
+            status, headers, body = e.status, [(b'content-type', b'application/json')], _encode_json({'error': str(e)})
+        except Exception as e:
+            status, headers, body = 500, [(b'content-type', b'application/json')], _encode_json({'error': str(e)})
+
+        headers.append((b'content-length', str(len(body)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+    async def stream(self, scope, receive, send):
+        """Server-sent events: a hello with the current data version, then one event per reload.
+
+        A client too slow to keep up gets a resync event with every row's
+        position instead of the deltas it missed. Events not newer than the
+        last version sent (queued before the hello or a resync) are skipped,
+        so each positions event's previous_version is the last data_version
+        the client received.
+        """
+        queue = self.change_feed.subscribe()
+        disconnect = asyncio.ensure_future(receive())
+        try:
+            try:
+                loaded = await asyncio.to_thread(self.get_loaded)
+            except ApiError as e:
+                body = _encode_json({'error': str(e)})
+                await send({'type': 'http.response.start', 'status': e.status,
+                            'headers': [(b'content-type', b'application/json')]})
+                await send({'type': 'http.response.body', 'body': body})
+                return
+
+            await send({'type': 'http.response.start', 'status': 200, 'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+            ]})
+            await self._send_event(send, 'hello', {'data_version': loaded.snapshot.version})
+            sent_version = loaded.snapshot.version
+
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnect}, timeout=HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_event in done:
+                    name, event = 'positions', next_event.result()
+                    if event is RESYNC:
+                        name, event = 'resync', await asyncio.to_thread(self.resync_event)
+                    if event['data_version'] > sent_version:
+                        await self._send_event(send, name, event)
+                        sent_version = event['data_version']
+                else:
+                    next_event.cancel()
+                if disconnect in done:
+                    if disconnect.result()['type'] == 'http.disconnect':
+                        return
+                    disconnect = asyncio.ensure_future(receive())
+                if not done:
+                    await send({'type': 'http.response.body', 'body': b': keep-alive\n\n', 'more_body': True})
+        finally:
+            disconnect.cancel()
+            self.change_feed.unsubscribe(queue)
+
+    def resync_event(self):
+        """Every row's position in the current snapshot, for a stream client that fell behind"""
+        loaded = self.get_loaded()
+        return {
+            'data_version': loaded.snapshot.version,
+            'positions': snapshot_positions(loaded.snapshot.processed_data, self.processor.row_key_columns),
+        }
+
+    @staticmethod
+    async def _send_event(send, name, payload):
+        data = _encode_json(payload)
+        event_id = str(payload.get('data_version', '')).encode('ascii')
+        message = b'event: ' + name.encode('ascii') + b'\nid: ' + event_id + b'\ndata: ' + data + b'\n\n'
+        await send({'type': 'http.response.body', 'body': message, 'more_body': True})
+
+
+app = RacingApi()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("utils.api_server:app", host="0.0.0.0", port=int(os.environ.get('PORT', 8000)))
@@ -8,7 +8,21 @@ from datetime import datetime, timedelta
 import io
 import base64
 import os
+from collections import deque, namedtuple
+from functools import partial
 from utils.racing_data_processor import RacingDataProcessor
+from utils.figure_cache import FigureCache
+from utils.instrumentation import Instrumentation
+from utils.rerun_profiler import (
+    MAX_PROFILED_RERUNS,
+    RerunProfiler,
+    forward_to_active_profiler,
+    payloads_frame,
+    rerun_log_frame,
+    spans_frame
+)
+from utils.workbook_cache import workbook_fingerprint
+from utils.workbook_watcher import WorkbookWatcher
 from utils.racing_visualizations import (
     create_total_gauge_view, 
     create_team_racing_view, 
@@ -24,9 +38,121 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Distinct workbooks kept processed in memory, shared by every session
+MAX_CACHED_WORKBOOKS = 8
+
+@st.cache_resource(show_spinner=False)
+def get_app_instrumentation():
+    """Processor stage and getter spans, passed on to the profiler of the session that ran them"""
+    return Instrumentation([forward_to_active_profiler])
+
+@st.cache_resource(max_entries=MAX_CACHED_WORKBOOKS, show_spinner=False)
+def load_racing_processor(content_hash, _excel_file_path):
+    """One processor per content hash, shared across sessions.
+
+    The workbook is read and processed by the first current_snapshot() call,
+    outside this cached function: Streamlit replays elements drawn inside a
+    cached function on every later hit, and a progress placeholder from the
+    first session can't be replayed into another run.
+    """
+    return RacingDataProcessor(_excel_file_path, instrumentation=get_app_instrumentation())
+
+@st.cache_resource(max_entries=MAX_CACHED_WORKBOOKS, show_spinner=False)
+def get_figure_cache(content_hash):
+    """Figures for one workbook, shared by every session viewing it"""
+    return FigureCache()
+
+def chart_name(view, race):
+    return view if race is None else f"{view} ({race})"
+
+def cached_figure(view, race, builder):
+    """Serve a view's figure from the shared cache, building it only when the data version is new"""
+    snapshot = st.session_state.racing_snapshot
+    figure_cache = get_figure_cache(st.session_state.workbook_hash)
+    profiler = st.session_state.rerun_profiler
+    
+    def build():
+        with profiler.block(f"build {chart_name(view, race)}"):
+            return builder()
+    
+    return figure_cache.get_or_build(view, race, snapshot.version, build)
+
+def show_chart(view, race, figure):
+    """Render a figure, timing its serialization and recording its payload size when profiling"""
+    profiler = st.session_state.rerun_profiler
+    name = chart_name(view, race)
+    with profiler.block(f"chart {name}"):
+        st.plotly_chart(figure, use_container_width=True)
+    profiler.record_payload(name, figure)
+
+def show_diagnostics(profile):
+    """Collapsible timings of this rerun and the session's recent reruns"""
+    st.session_state.rerun_log.append(profile)
+    with st.expander(f"🩺 Rerun diagnostics ({profile.seconds * 1000:.0f} ms)"):
+        st.markdown("**This rerun**")
+        st.dataframe(spans_frame(profile), hide_index=True, use_container_width=True)
+        if profile.payload_bytes:
+            st.markdown("**Chart payloads**")
+            st.dataframe(payloads_frame(profile), hide_index=True, use_container_width=True)
+        st.markdown(f"**Last {len(st.session_state.rerun_log)} profiled reruns**")
+        st.dataframe(rerun_log_frame(st.session_state.rerun_log), hide_index=True, use_container_width=True)
+
+@st.cache_resource(show_spinner=False)
+def get_workbook_watcher(excel_file_path):
+    """One background watcher per workbook path, shared by every session viewing it"""
+    def reload():
+        # Process the new content off the script thread; sessions pick it up from the cache
+        fingerprint = workbook_fingerprint(excel_file_path)
+        load_racing_processor(fingerprint.content_hash, excel_file_path).current_snapshot()
+        return fingerprint.content_hash
+    
+    return WorkbookWatcher(excel_file_path, reload).start()
+
+def store_snapshot(processor, snapshot, content_hash):
+    """Make a processed snapshot the one every view of this session reads"""
+    st.session_state.racing_processor = processor
+    st.session_state.racing_snapshot = snapshot
+    st.session_state.workbook_hash = content_hash
+    st.session_state.individual_data = snapshot.processed_data
+    st.session_state.team_data = snapshot.get_team_summary()
+    st.session_state.company_metrics = snapshot.get_total_company_metrics()
+    st.session_state.last_update = datetime.now()
+
+def sync_with_watcher(excel_file_path):
+    """Switch the session to the watcher's latest processed workbook once it has finished a new reload"""
+    watcher = get_workbook_watcher(excel_file_path)
+    # Read the version first: a reload finishing in between is then picked up on the next tick
+    version = (excel_file_path, watcher.reloads)
+    latest = watcher.latest
+    seen = st.session_state.watcher_version
+    st.session_state.watcher_version = version
+    # The first look at a watcher only records its version; the full run just read the file itself
+    if seen is None or seen[0] != excel_file_path or seen == version:
+        return
+    if latest is not None and latest != st.session_state.workbook_hash:
+        processor = load_racing_processor(latest, excel_file_path)
+        store_snapshot(processor, processor.current_snapshot(), latest)
+
+# How often the live dashboard checks the watcher's version; with the watcher's
+# poll and settle times a save shows up within about a second plus processing
+AUTO_REFRESH_SECONDS = 0.5
+
+@st.fragment(run_every=AUTO_REFRESH_SECONDS)
+def live_dashboard(excel_file_path):
+    """The data-driven part of the page, redrawn on its own when the watcher has processed a change.
+
+    Only this fragment reruns on the timer: the title and sidebar stay as they
+    are, figures come from the shared figure cache, and charts whose figure
+    didn't change are sent to the browser as cache references.
+    """
+    sync_with_watcher(excel_file_path)
+    render_data_views()
+
 # Initialize session state
 if 'racing_processor' not in st.session_state:
     st.session_state.racing_processor = None
+if 'racing_snapshot' not in st.session_state:
+    st.session_state.racing_snapshot = None
 if 'individual_data' not in st.session_state:
     st.session_state.individual_data = None
 if 'team_data' not in st.session_state:
@@ -35,8 +161,213 @@ if 'company_metrics' not in st.session_state:
     st.session_state.company_metrics = None
 if 'last_update' not in st.session_state:
     st.session_state.last_update = None
+if 'workbook_hash' not in st.session_state:
+    st.session_state.workbook_hash = None
+if 'watcher_version' not in st.session_state:
+    st.session_state.watcher_version = None
+if 'rerun_log' not in st.session_state:
+    st.session_state.rerun_log = deque(maxlen=MAX_PROFILED_RERUNS)
+
+def render_total_gauge_view():
+    """Company gauge, performance summary and team leaderboard"""
+    st.markdown("### ⚡ Total Company Performance Gauge")
+    
+    # Full-width large gauge
+    fig_gauge = cached_figure(
+        'total_gauge', None,
+        lambda: create_total_gauge_view(st.session_state.company_metrics)
+    )
+    show_chart('total_gauge', None, fig_gauge)
+    
+    st.divider()
+    
+    # Performance summary and team overview below gauge
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Performance summary
+        st.markdown("#### 📊 Performance Summary")
+        metrics = st.session_state.company_metrics
+        
+        st.info(f"""
+        **Company Overview:**
+        - 👥 Total Consultants: {metrics['total_consultants']}
+        - 💰 Sales Achievement: {metrics['overall_sales_achievement']:.1f}%
+        - 📋 Apps Achievement: {metrics['overall_apps_achievement']:.1f}%
+        - 🏆 Champion: {metrics['top_performer']}
+        """)
+    
+    with col2:
+        # Team performance summary
+        st.markdown("#### 👥 Team Performance Leaderboard")
+        team_perf = cached_figure(
+            'team_performance_summary', None,
+            lambda: create_team_performance_summary(st.session_state.team_data)
+        )
+        show_chart('team_performance_summary', None, team_perf)
+
+def render_team_racing_view():
+    """Team race for the selected race, with pit crew, pole position and race statistics"""
+    st.markdown("### 🏎️ Team Racing Championship")
+    
+    # Race selection toggle
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        selected_race = st.selectbox(
+            "🏁 Select Race:",
+            st.session_state.racing_snapshot.race_registry.race_names(),
+            index=0
+        )
+    
+    with col2:
+        race_emoji = "🏎️" if selected_race == "Monaco" else "🦁"
+        st.info(f"{race_emoji} Now viewing {selected_race} Grand Prix results")
+    
+    # Get race-specific data
+    race_individual_data = st.session_state.racing_snapshot.get_racing_leaderboard_by_race(selected_race, top_n=10)
+    race_team_data = st.session_state.racing_snapshot.get_team_summary_by_race(selected_race)
+    
+    # Create and display team racing view
+    fig_racing = cached_figure(
+        'team_racing', selected_race,
+        lambda: create_team_racing_view(race_team_data, race_individual_data)
+    )
+    show_chart('team_racing', selected_race, fig_racing)
+    
+    # Racing statistics
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.markdown("##### 🔧 Pit Crew - Agent Performance")
+        if not race_individual_data.empty:
+            leaders = race_individual_data.head(3)
+            for idx, (_, row) in enumerate(leaders.iterrows()):
+                emoji = ["🥇", "🥈", "🥉"][idx]
+                st.markdown(f"{emoji} **{row['Consultant Name']}** - {row['overall_performance']:.1f}%")
+        else:
+            st.write("No pit crew in this race yet")
+    
+    with col2:
+        st.markdown("##### 🚀 Pole Position - Drivers")
+        if not race_team_data.empty:
+            top_teams = race_team_data.nlargest(3, 'team_sales_achievement')
+            for idx, (_, team) in enumerate(top_teams.iterrows()):
+                emoji = ["🏆", "🥈", "🥉"][idx]
+                st.markdown(f"{emoji} **{team['team_name']}** - {team['team_sales_achievement']:.1f}%")
+        else:
+            st.write("No drivers in this race yet")
+    
+    with col3:
+        st.markdown("##### 🏃 Pit Stop Needed")
+        if not race_individual_data.empty:
+            behind = race_individual_data.tail(3)
+            for _, row in behind.iterrows():
+                gap = 100 - row['overall_performance']
+                st.markdown(f"⚠️ **{row['Consultant Name']}** - {gap:.1f}% behind")
+        else:
+            st.write("All racers performing well!")
+    
+    # Race statistics summary
+    st.markdown("<br>", unsafe_allow_html=True)  # Add some spacing
+    st.divider()
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("🏁 Race Participants", len(race_individual_data))
+    with col2:
+        st.metric("🏆 Teams Racing", len(race_team_data))
+    with col3:
+        avg_performance = race_individual_data['overall_performance'].mean() if not race_individual_data.empty else 0
+        st.metric("📊 Avg Performance", f"{avg_performance:.1f}%")
+    with col4:
+        top_speed = race_individual_data['overall_performance'].max() if not race_individual_data.empty else 0
+        st.metric("🚀 Top Performance", f"{top_speed:.1f}%")
+
+def render_course_view(race_name, image_path):
+    """A race's course map with its supervisor lap leaders and achievement"""
+    st.markdown(f"### 🗺️ {race_name} Grand Prix Course Map")
+    
+    # Get the race's team data
+    race_team_data = st.session_state.racing_snapshot.get_team_summary_by_race(race_name)
+    
+    # Create and display the course map with the actual track image
+    fig_course = cached_figure(
+        'course_map', race_name,
+        lambda: create_course_map_view(race_team_data, image_path, race_name)
+    )
+    show_chart('course_map', race_name, fig_course)
+    
+    # Live race information for the race's supervisors
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown(f"#### 🏁 {race_name} Supervisor Performance")
+        
+        # Top lap leaders (supervisors)
+        st.markdown(f"**🏆 {race_name} Supervisor Lap Leaders:**")
+        if not race_team_data.empty:
+            for i, (_, team) in enumerate(race_team_data.head(5).iterrows()):
+                # Laps and pace come precomputed with the snapshot's team summary
+                st.write(
+                    f"{i+1}. **{team['team_name']}**: {int(team['laps_completed'])} laps completed "
+                    f"({team['pace'] * 100:.0f}% pace)"
+                )
+        else:
+            st.write(f"No {race_name} supervisors found")
+    
+    with col2:
+        st.markdown(f"#### 📊 {race_name} Team Statistics")
+        # Show team performance metrics
+        st.markdown(f"**{race_name} Supervisor Achievement:**")
+        if not race_team_data.empty:
+            for i, (_, team) in enumerate(race_team_data.head(5).iterrows()):
+                st.write(f"{i+1}. **{team['team_name']}**: {team['team_sales_achievement']:.1f}% achievement")
+        else:
+            st.write(f"No {race_name} supervisors found")
+
+MONACO_IMAGE_PATH = "attached_assets/monaco_map_bg_1755264624179.png"
+KYALAMI_IMAGE_PATH = "attached_assets/kyalami_map_bg_1755264624180.png"
+
+# Dashboard views by id (also accepted as ?view=<id>); only the selected view's
+# data is queried and its figures built on a rerun, the others when first opened
+DashboardView = namedtuple('DashboardView', ['label', 'render'])
+DASHBOARD_VIEWS = {
+    'gauge': DashboardView("⚡ Total Gauge", render_total_gauge_view),
+    'racing': DashboardView("🏎️ Team Racing", render_team_racing_view),
+    'monaco': DashboardView("🗺️ Monaco Course", partial(render_course_view, 'Monaco', MONACO_IMAGE_PATH)),
+    'kyalami': DashboardView("🗺️ Kyalami Course", partial(render_course_view, 'Kyalami', KYALAMI_IMAGE_PATH)),
+}
+
+def select_view():
+    """The id of the dashboard view to render, chosen with a view switcher that stays put across reruns"""
+    if 'active_view' not in st.session_state:
+        # Wallboards can open straight onto a view
+        requested = st.query_params.get('view')
+        st.session_state.active_view = requested if requested in DASHBOARD_VIEWS else next(iter(DASHBOARD_VIEWS))
+    
+    return st.radio(
+        "View",
+        list(DASHBOARD_VIEWS),
+        format_func=lambda view_id: DASHBOARD_VIEWS[view_id].label,
+        key='active_view',
+        horizontal=True,
+        label_visibility='collapsed'
+    )
 
 def main():
+    # Opt-in timing of this rerun's blocks (the settings checkbox keeps its value in session state)
+    profiler = RerunProfiler(st.session_state.get('profile_reruns', False))
+    st.session_state.rerun_profiler = profiler
+    try:
+        render_dashboard(profiler)
+    finally:
+        profile = profiler.finish()
+        # Live dashboard ticks between full reruns aren't profiled
+        st.session_state.rerun_profiler = RerunProfiler()
+    if profiler.enabled:
+        show_diagnostics(profile)
+
+def render_dashboard(profiler):
     st.title("🏁 Sales Racing Dashboard")
     st.markdown("### Interactive Sales Gamification & Competition Tracking")
     
@@ -74,38 +405,48 @@ def main():
         
         if excel_file_path:
             try:
-                # Process racing data
-                processor = RacingDataProcessor(excel_file_path)
-                individual_data = processor.process_for_racing_dashboard()
-                team_data = processor.get_team_summary()
-                company_metrics = processor.get_total_company_metrics()
-                
-                # Store in session state
-                st.session_state.racing_processor = processor
-                st.session_state.individual_data = individual_data
-                st.session_state.team_data = team_data
-                st.session_state.company_metrics = company_metrics
-                st.session_state.last_update = datetime.now()
-                
-                st.info(f"📊 {len(individual_data)} consultants loaded")
-                st.info(f"👥 {len(team_data)} teams identified")
-                
-                # Show data preview
-                with st.expander("Racing Data Preview"):
-                    st.write("**Top 5 Performers:**")
-                    preview_cols = ['Consultant Name', 'Supervisor Name', 'overall_performance', 'vehicle_type']
-                    st.dataframe(individual_data[preview_cols].head())
+                with profiler.block("sidebar ingest"):
+                    # Process racing data
+                    # Stream the sheet, showing progress while rows arrive (only in the run that reads the workbook)
+                    loading_status = st.empty()
+                    rows_read = [0]
+                    
+                    def show_progress(chunk):
+                        rows_read[0] += len(chunk)
+                        loading_status.caption(f"⏳ {rows_read[0]} consultant rows read...")
                     
+                    # Identical workbooks (even uploaded under different names) share one processor
+                    fingerprint = workbook_fingerprint(excel_file_path)
+                    processor = load_racing_processor(fingerprint.content_hash, excel_file_path)
+                    # Every view in this run reads the same snapshot of the data
+                    snapshot = processor.current_snapshot(on_chunk=show_progress)
+                    loading_status.empty()
+                    
+                    # Store in session state
+                    store_snapshot(processor, snapshot, fingerprint.content_hash)
+                    individual_data = st.session_state.individual_data
+                    team_data = st.session_state.team_data
+                    
+                    st.info(f"📊 {len(individual_data)} consultants loaded")
+                    st.info(f"👥 {len(team_data)} teams identified")
+                    
+                    # Show data preview
+                    with st.expander("Racing Data Preview"):
+                        st.write("**Top 5 Performers:**")
+                        preview_cols = ['Consultant Name', 'Supervisor Name', 'overall_performance', 'vehicle_type']
+                        st.dataframe(individual_data[preview_cols].head())
+                        
             except Exception as e:
                 st.error(f"❌ Error processing racing data: {str(e)}")
                 st.info("Please ensure your Excel file contains the 'Sales Perfromance' sheet")
         
         # Auto-refresh toggle
         st.header("⚙️ Settings")
-        auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
+        auto_refresh = st.checkbox("Auto-refresh when the workbook changes", value=False)
         
-        if auto_refresh:
-            st.rerun()
+        # Per-block timings of each rerun, shown below the dashboard
+        st.checkbox("Profile reruns", value=False, key='profile_reruns',
+                    help="Time the sidebar ingest, the open view, each figure build and chart, and show chart payload sizes.")
         
         # Manual refresh button
         if st.button("🔄 Refresh Data"):
@@ -113,237 +454,61 @@ def main():
                 st.rerun()
     
     # Main content area
-    if st.session_state.individual_data is not None:
-        # Display last update time
-        if st.session_state.last_update:
-            st.caption(f"Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        # Key metrics row
-        metrics = st.session_state.company_metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "💰 Total Sales",
-                f"R{metrics['total_sales_actual']/1000000:.1f}M",
-                delta=f"{metrics['overall_sales_achievement']-100:+.1f}% vs Target"
-            )
-        
-        with col2:
-            st.metric(
-                "🎯 Sales Target",
-                f"R{metrics['total_sales_target']/1000000:.1f}M",
-                delta=f"{metrics['overall_sales_achievement']:.1f}% Achieved"
-            )
-        
-        with col3:
-            st.metric(
-                "📊 Avg Performance",
-                f"{metrics['avg_individual_performance']:.1f}%",
-                delta=f"{metrics['avg_individual_performance']-100:+.1f}% vs Target"
-            )
-        
-        with col4:
-            st.metric(
-                "🏆 Racing Champion",
-                metrics['top_performer'],
-                delta=f"#{st.session_state.individual_data.iloc[0]['race_position']} Position"
-            )
-        
-        st.divider()
-        
-        # Racing Dashboard Views
-        st.subheader("🏁 Monaco Sales Grand Prix Dashboard")
-        
-        # Create tabs for the 3 specific racing views
-        tab1, tab2, tab3, tab4 = st.tabs(["⚡ Total Gauge", "🏎️ Team Racing", "🗺️ Monaco Course", "🗺️ Kyalami Course"])
-        
-        with tab1:
-            # Total Gauge View
-            st.markdown("### ⚡ Total Company Performance Gauge")
-            
-            # Full-width large gauge
-            fig_gauge = create_total_gauge_view(st.session_state.company_metrics)
-            st.plotly_chart(fig_gauge, use_container_width=True)
-            
-            st.divider()
-            
-            # Performance summary and team overview below gauge
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Performance summary
-                st.markdown("#### 📊 Performance Summary")
-                metrics = st.session_state.company_metrics
-                
-                st.info(f"""
-                **Company Overview:**
-                - 👥 Total Consultants: {metrics['total_consultants']}
-                - 💰 Sales Achievement: {metrics['overall_sales_achievement']:.1f}%
-                - 📋 Apps Achievement: {metrics['overall_apps_achievement']:.1f}%
-                - 🏆 Champion: {metrics['top_performer']}
-                """)
-            
-            with col2:
-                # Team performance summary
-                st.markdown("#### 👥 Team Performance Leaderboard")
-                team_perf = create_team_performance_summary(st.session_state.team_data)
-                st.plotly_chart(team_perf, use_container_width=True)
-        
-        with tab2:
-            # Team Racing View with Race Toggle
-            st.markdown("### 🏎️ Team Racing Championship")
-            
-            # Race selection toggle
-            col1, col2 = st.columns([1, 3])
-            with col1:
-                selected_race = st.selectbox(
-                    "🏁 Select Race:",
-                    ["Monaco", "Kyalami"],
-                    index=0
-                )
-            
-            with col2:
-                race_emoji = "🏎️" if selected_race == "Monaco" else "🦁"
-                st.info(f"{race_emoji} Now viewing {selected_race} Grand Prix results")
-            
-            # Get race-specific data
-            race_individual_data = st.session_state.racing_processor.get_racing_leaderboard_by_race(selected_race, top_n=10)
-            race_team_data = st.session_state.racing_processor.get_team_summary_by_race(selected_race)
-            
-            # Create and display team racing view
-            fig_racing = create_team_racing_view(race_team_data, race_individual_data)
-            st.plotly_chart(fig_racing, use_container_width=True)
-            
-            # Racing statistics
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("##### 🔧 Pit Crew - Agent Performance")
-                if not race_individual_data.empty:
-                    leaders = race_individual_data.head(3)
-                    for idx, (_, row) in enumerate(leaders.iterrows()):
-                        emoji = ["🥇", "🥈", "🥉"][idx]
-                        st.markdown(f"{emoji} **{row['Consultant Name']}** - {row['overall_performance']:.1f}%")
-                else:
-                    st.write("No pit crew in this race yet")
-            
-            with col2:
-                st.markdown("##### 🚀 Pole Position - Drivers")
-                if not race_team_data.empty:
-                    top_teams = race_team_data.nlargest(3, 'team_sales_achievement')
-                    for idx, (_, team) in enumerate(top_teams.iterrows()):
-                        emoji = ["🏆", "🥈", "🥉"][idx]
-                        st.markdown(f"{emoji} **{team['team_name']}** - {team['team_sales_achievement']:.1f}%")
-                else:
-                    st.write("No drivers in this race yet")
-            
-            with col3:
-                st.markdown("##### 🏃 Pit Stop Needed")
-                if not race_individual_data.empty:
-                    behind = race_individual_data.tail(3)
-                    for _, row in behind.iterrows():
-                        gap = 100 - row['overall_performance']
-                        st.markdown(f"⚠️ **{row['Consultant Name']}** - {gap:.1f}% behind")
-                else:
-                    st.write("All racers performing well!")
-            
-            # Race statistics summary
-            st.markdown("<br>", unsafe_allow_html=True)  # Add some spacing
-            st.divider()
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("🏁 Race Participants", len(race_individual_data))
-            with col2:
-                st.metric("🏆 Teams Racing", len(race_team_data))
-            with col3:
-                avg_performance = race_individual_data['overall_performance'].mean() if not race_individual_data.empty else 0
-                st.metric("📊 Avg Performance", f"{avg_performance:.1f}%")
-            with col4:
-                top_speed = race_individual_data['overall_performance'].max() if not race_individual_data.empty else 0
-                st.metric("🚀 Top Performance", f"{top_speed:.1f}%")
-        
-        with tab3:
-            # Monaco Course Map View
-            st.markdown("### 🗺️ Monaco Grand Prix Course Map")
-            
-            # Get Monaco team data
-            monaco_team_data = st.session_state.racing_processor.get_team_summary_by_race('Monaco')
-            
-            # Create and display Monaco course map with actual track image
-            monaco_image_path = "attached_assets/monaco_map_bg_1755264624179.png"
-            fig_monaco_course = create_course_map_view(monaco_team_data, monaco_image_path, "Monaco")
-            st.plotly_chart(fig_monaco_course, use_container_width=True)
-            
-            # Live race information for Monaco supervisors
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 🏁 Monaco Supervisor Performance")
-                
-                # Top lap leaders (supervisors)
-                st.markdown("**🏆 Monaco Supervisor Lap Leaders:**")
-                if not monaco_team_data.empty:
-                    for i, (_, team) in enumerate(monaco_team_data.head(5).iterrows()):
-                        daily_target = team['SalesValTarget'] / 31
-                        daily_achievement = team['TotalSalesVal'] / 31
-                        laps_completed = daily_achievement / daily_target if daily_target > 0 else 0
-                        st.write(f"{i+1}. **{team['team_name']}**: {int(laps_completed):.0f} laps completed")
-                else:
-                    st.write("No Monaco supervisors found")
-            
-            with col2:
-                st.markdown("#### 📊 Monaco Team Statistics")
-                # Show team performance metrics
-                st.markdown("**Monaco Supervisor Achievement:**")
-                if not monaco_team_data.empty:
-                    for i, (_, team) in enumerate(monaco_team_data.head(5).iterrows()):
-                        st.write(f"{i+1}. **{team['team_name']}**: {team['team_sales_achievement']:.1f}% achievement")
-                else:
-                    st.write("No Monaco supervisors found")
-        
-        with tab4:
-            # Kyalami Course Map View  
-            st.markdown("### 🗺️ Kyalami Grand Prix Course Map")
-            
-            # Get Kyalami team data
-            kyalami_team_data = st.session_state.racing_processor.get_team_summary_by_race('Kyalami')
-            
-            # Create and display Kyalami course map with actual track image
-            kyalami_image_path = "attached_assets/kyalami_map_bg_1755264624180.png"
-            fig_kyalami_course = create_course_map_view(kyalami_team_data, kyalami_image_path, "Kyalami")
-            st.plotly_chart(fig_kyalami_course, use_container_width=True)
-            
-            # Live race information for Kyalami supervisors
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 🏁 Kyalami Supervisor Performance")
-                
-                # Top lap leaders (supervisors)
-                st.markdown("**🏆 Kyalami Supervisor Lap Leaders:**")
-                if not kyalami_team_data.empty:
-                    for i, (_, team) in enumerate(kyalami_team_data.head(5).iterrows()):
-                        daily_target = team['SalesValTarget'] / 31
-                        daily_achievement = team['TotalSalesVal'] / 31
-                        laps_completed = daily_achievement / daily_target if daily_target > 0 else 0
-                        st.write(f"{i+1}. **{team['team_name']}**: {int(laps_completed):.0f} laps completed")
-                else:
-                    st.write("No Kyalami supervisors found")
-            
-            with col2:
-                st.markdown("#### 📊 Kyalami Team Statistics")
-                # Show team performance metrics
-                st.markdown("**Kyalami Supervisor Achievement:**")
-                if not kyalami_team_data.empty:
-                    for i, (_, team) in enumerate(kyalami_team_data.head(5).iterrows()):
-                        st.write(f"{i+1}. **{team['team_name']}**: {team['team_sales_achievement']:.1f}% achievement")
-                else:
-                    st.write("No Kyalami supervisors found")
-    else:
+    if st.session_state.individual_data is None:
         st.warning("📊 Please load racing data using the sidebar to view the Monaco Sales Grand Prix Dashboard.")
         st.info("ℹ️ Check the 'Use existing Direct Sales Gamification file' checkbox in the sidebar to load data.")
+    elif auto_refresh and excel_file_path:
+        live_dashboard(excel_file_path)
+    else:
+        render_data_views()
+
+def render_data_views():
+    """Last update, key metrics and the selected view, all read from the session's snapshot"""
+    # Display last update time
+    if st.session_state.last_update:
+        st.caption(f"Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Key metrics row
+    metrics = st.session_state.company_metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            "💰 Total Sales",
+            f"R{metrics['total_sales_actual']/1000000:.1f}M",
+            delta=f"{metrics['overall_sales_achievement']-100:+.1f}% vs Target"
+        )
+    
+    with col2:
+        st.metric(
+            "🎯 Sales Target",
+            f"R{metrics['total_sales_target']/1000000:.1f}M",
+            delta=f"{metrics['overall_sales_achievement']:.1f}% Achieved"
+        )
+    
+    with col3:
+        st.metric(
+            "📊 Avg Performance",
+            f"{metrics['avg_individual_performance']:.1f}%",
+            delta=f"{metrics['avg_individual_performance']-100:+.1f}% vs Target"
+        )
+    
+    with col4:
+        st.metric(
+            "🏆 Racing Champion",
+            metrics['top_performer'],
+            delta=f"#{st.session_state.individual_data.iloc[0]['race_position']} Position"
+        )
+    
+    st.divider()
+    
+    # Racing Dashboard Views
+    st.subheader("🏁 Monaco Sales Grand Prix Dashboard")
+    
+    # Only the selected view runs; unlike st.tabs, the hidden views cost nothing
+    view_id = select_view()
+    with st.session_state.rerun_profiler.block(f"view {view_id}"):
+        DASHBOARD_VIEWS[view_id].render()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
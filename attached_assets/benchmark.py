@@ -0,0 +1,249 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregates import AggregationCube
+from utils.compaction import compact_frame
+from utils.race_registry import RaceRegistry
+from utils.racing_data_processor import RacingDataProcessor, RacingSnapshot
+from utils.racing_visualizations import (
+    create_course_map_view,
+    create_team_performance_summary,
+    create_team_racing_view,
+    create_total_gauge_view,
+)
+from utils.utils import generate_sales_performance_data, write_sample_workbook
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# Workbook parsing is only timed up to this many rows; bigger frames are generated in memory
+DEFAULT_MAX_WORKBOOK_ROWS = 100_000
+DEFAULT_OUTPUT = 'benchmark_results.json'
+DEFAULT_TRACK_IMAGE = 'attached_assets/kyalami_map_bg_1755438535965.png'
+WORKBOOK_DIR = os.path.join('.racing_cache', 'benchmark')
+# Share of rows changed between two loads for the incremental refresh stage
+CHANGED_ROW_SHARE = 0.01
+# Share of consultants with nothing booked yet; real sheets have this many tied on a score of 0
+DEFAULT_IDLE_SHARE = 0.16
+# A stage this much slower than in the baseline counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+
+
+def measure(fn, setup=None, repeat=3, memory=True, warmup=False):
+    """Best-of-`repeat` wall time of fn(setup()), plus peak traced allocation of one more run.
+
+    `setup` builds a fresh input for each run (untimed), for stages that modify
+    their input. `warmup` adds an untimed first run, for code with one-off lazy
+    initialisation (plotly figure validators). Returns (result, seconds, peak_bytes).
+    """
+    if warmup:
+        fn(*((setup(),) if setup else ()))
+
+    seconds = float('inf')
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak_bytes = None
+    if memory:
+        args = (setup(),) if setup else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn(*args)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak_bytes
+
+
+def sample_workbook(n_rows, n_supervisors, n_races, seed, idle_share):
+    """Path of a generated workbook, written once per size, seed and idle share"""
+    os.makedirs(WORKBOOK_DIR, exist_ok=True)
+    path = os.path.join(WORKBOOK_DIR, f"sales_{n_rows}_{n_supervisors}_{n_races}_{seed}_{idle_share}.xlsx")
+    if not os.path.exists(path):
+        write_sample_workbook(path, n_rows, n_supervisors, n_races, seed, idle_share)
+    return path
+
+
+def changed_rows(raw, share=CHANGED_ROW_SHARE, seed=0):
+    """Copy of a raw sheet with a share of consultants' sales moved and a loan deal booked each, as a day's
+    update would (idle consultants stay on 0, so their rows change without leaving the tie)"""
+    changed = raw.copy()
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(changed), max(1, int(len(changed) * share)), replace=False)
+    sales = changed['TotalSalesVal'].to_numpy(dtype=float, copy=True)
+    rates = changed['Sales Val % to Target'].to_numpy(dtype=float, copy=True)
+    loans = changed['LoanDealsVol'].to_numpy(dtype=float, copy=True)
+    growth = rng.uniform(1.0, 1.2, len(rows))
+    sales[rows] *= growth
+    rates[rows] *= growth
+    loans[rows] += 1
+    changed['TotalSalesVal'] = sales
+    changed['Sales Val % to Target'] = rates
+    changed['LoanDealsVol'] = loans
+    return changed
+
+
+def benchmark_size(n_rows, n_supervisors, n_races, seed, repeat, memory, max_workbook_rows, track_image,
+                   idle_share=DEFAULT_IDLE_SHARE):
+    """Time every stage of the pipeline for one data size; returns a list of result records"""
+    results = []
+
+    def record(stage, fn, setup=None, stage_repeat=None):
+        result, seconds, peak_bytes = measure(
+            fn, setup, repeat if stage_repeat is None else stage_repeat, memory, warmup=stage.startswith('figure_')
+        )
+        results.append({
+            'rows': n_rows,
+            'stage': stage,
+            'seconds': seconds,
+            'peak_mb': None if peak_bytes is None else peak_bytes / 1e6,
+        })
+        print(f"{n_rows:>10,} {stage:<28} {seconds * 1000:>10.1f} ms"
+              + ("" if peak_bytes is None else f" {peak_bytes / 1e6:>9.1f} MB peak"), flush=True)
+        return result
+
+    raw, races = generate_sales_performance_data(n_rows, n_supervisors, n_races, seed, idle_share)
+    registry = RaceRegistry(races)
+    race_name = registry.race_names()[0]
+
+    path = None
+    if n_rows <= max_workbook_rows:
+        path = sample_workbook(n_rows, n_supervisors, n_races, seed, idle_share)
+        parser = RacingDataProcessor(path, cache=False, race_registry=registry)
+        raw = record('load_workbook', parser.load_sales_performance_data, stage_repeat=1)
+
+    processor = RacingDataProcessor(path or '<generated>', cache=False, race_registry=registry)
+
+    # Individual stages, each fed the previous stage's output
+    cleaned = record('clean', lambda: processor.clean_data(raw))
+    compacted = record('compact', compact_frame, setup=cleaned.copy)
+    metrics = record('metrics', processor.calculate_racing_metrics, setup=compacted.copy)
+    ranked = record('ranking', lambda: processor.add_racing_positions(metrics))
+    ranked = record('assign_races', processor.assign_races, setup=ranked.copy)
+    snapshot = record('snapshot', lambda: RacingSnapshot(1, ranked, None, registry))
+    record('team_summary', lambda cube: cube.team_summary(race_name, sort_by='team_sales_achievement'),
+           setup=lambda: AggregationCube(ranked, snapshot.calendar))
+
+    # End-to-end processing, from scratch and after a small update
+    def fresh_processor():
+        processor.snapshot = None
+        processor.raw_data = raw
+        return processor
+
+    record('process_full', lambda p: p.process_for_racing_dashboard(), setup=fresh_processor)
+    base_snapshot = processor.snapshot
+    updated = changed_rows(raw, seed=seed)
+
+    def updated_processor():
+        processor.snapshot = base_snapshot
+        processor.raw_data = updated
+        return processor
+
+    record('process_incremental', lambda p: p.process_changed_rows(), setup=updated_processor)
+
+    # Getters and figure builders on one snapshot
+    snapshot = fresh_processor().current_snapshot()
+    team_data = snapshot.get_team_summary_by_race(race_name)
+    individual_data = record('leaderboard_by_race', lambda: snapshot.get_racing_leaderboard_by_race(race_name, 10))
+    record('figure_total_gauge', lambda: create_total_gauge_view(snapshot.get_total_company_metrics()))
+    record('figure_team_racing', lambda: create_team_racing_view(team_data, individual_data))
+    record('figure_course_map', lambda: create_course_map_view(team_data, track_image, race_name))
+    record('figure_team_summary', lambda: create_team_performance_summary(snapshot.get_team_summary()))
+
+    # The older generic processor, when its dependencies are installed
+    if path is not None:
+        try:
+            from utils.data_processor import DataProcessor
+        except ImportError:
+            pass
+        else:
+            record('data_processor_excel', lambda: DataProcessor().process_excel_file(path), stage_repeat=1)
+
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Print per-stage timing ratios against a baseline run; returns the regressed (rows, stage) pairs"""
+    before = {(r['rows'], r['stage']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    print(f"\n{'rows':>10} {'stage':<28} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for r in results:
+        key = (r['rows'], r['stage'])
+        if key not in before or not before[key]:
+            continue
+        ratio = r['seconds'] / before[key]
+        flag = '  REGRESSION' if ratio > threshold else ''
+        if flag:
+            regressions.append(key)
+        print(f"{r['rows']:>10,} {r['stage']:<28} {before[key] * 1000:>10.1f} {r['seconds'] * 1000:>10.1f} "
+              f"{ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the racing processing and rendering pipeline")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES, help="consultant counts to run")
+    parser.add_argument('--supervisors', type=int, default=18)
+    parser.add_argument('--races', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--idle-share', type=float, default=DEFAULT_IDLE_SHARE,
+                        help="share of consultants with nothing booked yet (tied on a score of 0)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced run for peak memory")
+    parser.add_argument('--max-workbook-rows', type=int, default=DEFAULT_MAX_WORKBOOK_ROWS,
+                        help="largest size read from a generated xlsx; bigger sizes start from memory")
+    parser.add_argument('--track-image', default=DEFAULT_TRACK_IMAGE,
+                        help="course map background (relative paths are from the working directory)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON file to write results to")
+    parser.add_argument('--compare', help="baseline JSON from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+    # Without the image the course map stage would time the no-background fallback instead
+    if not os.path.isfile(args.track_image):
+        parser.error(f"track image not found: {args.track_image}")
+
+    results = []
+    for n_rows in args.rows:
+        results.extend(benchmark_size(
+            n_rows, args.supervisors, args.races, args.seed, args.repeat,
+            not args.no_memory, args.max_workbook_rows, args.track_image, args.idle_share
+        ))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
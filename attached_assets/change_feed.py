@@ -0,0 +1,101 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.racing_data_processor import ROW_KEY_COLUMNS
+
+# Columns whose movement is pushed to subscribers
+TRACKED_COLUMNS = ['race_position', 'overall_performance', 'TotalSalesVal']
+
+MAX_PENDING_EVENTS = 100
+# Queued in place of the backlog of a subscriber that fell MAX_PENDING_EVENTS behind
+RESYNC = 'resync'
+
+
+def _records(frame, cols):
+    return frame[cols].astype(object).where(frame[cols].notna(), None).to_dict(orient='records')
+
+
+def diff_positions(previous, current, key_columns=ROW_KEY_COLUMNS):
+    """Rows whose position or achievement moved between two processed frames.
+
+    Rows are matched on `key_columns` (the processor's row_key_columns).
+    Returns a dict with `changed` (key, new and previous values), `added`
+    and `removed` consultant records, computed with one vectorized merge.
+    """
+    key_columns = list(key_columns)
+    columns = key_columns + TRACKED_COLUMNS
+    if previous is None:
+        previous = pd.DataFrame(columns=columns)
+
+    merged = current[columns].merge(
+        previous[columns], on=key_columns, how='outer',
+        suffixes=('', '_previous'), indicator=True
+    )
+    both = merged[merged['_merge'] == 'both']
+
+    moved = np.zeros(len(both), dtype=bool)
+    for col in TRACKED_COLUMNS:
+        moved |= ~np.isclose(
+            both[col].to_numpy(dtype=float), both[f'{col}_previous'].to_numpy(dtype=float), equal_nan=True
+        )
+
+    previous_columns = [f'{col}_previous' for col in TRACKED_COLUMNS]
+    return {
+        'changed': _records(both[moved], columns + previous_columns),
+        'added': _records(merged[merged['_merge'] == 'left_only'], columns),
+        'removed': _records(merged[merged['_merge'] == 'right_only'], key_columns),
+    }
+
+
+def snapshot_positions(current, key_columns=ROW_KEY_COLUMNS):
+    """Key and tracked values of every row, for a subscriber that has to start over"""
+    return _records(current, list(key_columns) + TRACKED_COLUMNS)
+
+
+class ChangeFeed:
+    """Fan-out of change events from a worker thread to asyncio subscribers (SSE clients).
+
+    Events are delivered in order and without gaps, or, to a subscriber that
+    fell behind, as RESYNC followed by the events published after it.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING_EVENTS):
+        self.max_pending = max_pending
+        self.latest = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a subscriber on the running event loop; returns its queue"""
+        queue = asyncio.Queue(maxsize=self.max_pending)
+        with self._lock:
+            self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = {(loop, q) for loop, q in self._subscribers if q is not queue}
+
+    def publish(self, event):
+        """Deliver an event to every subscriber; safe to call from any thread"""
+        with self._lock:
+            self.latest = event
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, event)
+
+    @staticmethod
+    def _offer(queue, event):
+        # A slow client doesn't stall the feed; deltas with a gap in them are useless
+        # though, so its whole backlog is replaced by one RESYNC to the current data
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            event = RESYNC
+        queue.put_nowait(event)
+
+    def __len__(self):
+        return len(self._subscribers)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Whole-number volumes, stored as int32 when every value fits
+COUNT_COLUMNS = [
+    'RealAppsTarget', 'TotalRealAppsVol', 'LoanDealsVol', 'CardDealsVol', 'CreditCardDealTarget'
+]
+
+# Repeated labels, stored once per distinct value
+CATEGORY_COLUMNS = ['Consultant Name', 'Supervisor Name', 'region', 'vehicle_type', 'performance_color']
+
+# Labels only become categorical when at most this share of values is distinct;
+# codes plus a category per row cost more than plain strings (e.g. unique names)
+MAX_CATEGORY_RATIO = 0.5
+
+# Money (SalesValTarget, TotalSalesVal, ...) stays float64: rand amounts in the
+# millions with cents need more digits than float32 has, and int64 cents would
+# take the same 8 bytes per value as float64 does now.
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _fits_int32(values):
+    values = values.to_numpy(dtype=float)
+    return bool(np.isfinite(values).all()
+                and (values == np.trunc(values)).all()
+                and (values.size == 0 or (values.min() >= _INT32.min and values.max() <= _INT32.max)))
+
+
+def compact_frame(df):
+    """Downcast whole-number count columns to int32 and label columns to categoricals.
+
+    Categories are sorted, so sorting or grouping by a compacted label column
+    gives the same order as the plain strings. Columns that are missing or
+    already categorical, counts that aren't whole numbers and mostly-unique
+    labels are left as they are.
+    """
+    for col in COUNT_COLUMNS:
+        if col in df.columns and df[col].dtype != np.int32 and _fits_int32(df[col]):
+            df[col] = df[col].astype(np.int32)
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            if df[col].nunique() <= len(df) * MAX_CATEGORY_RATIO:
+                df[col] = pd.Categorical(df[col])
+
+    return df
+
+
+def uncompacted(df):
+    """The frame in the layout it would have without compaction (plain strings, float64 counts)"""
+    dtypes = {col: str for col in CATEGORY_COLUMNS if col in df.columns}
+    dtypes.update({col: np.float64 for col in COUNT_COLUMNS if col in df.columns})
+    return df.astype(dtypes)
+
+
+def memory_report(before, after):
+    """Per-column deep memory usage (bytes) and dtypes of a frame before and after compaction"""
+    columns = list(dict.fromkeys(list(before.columns) + list(after.columns)))
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str).reindex(columns),
+        'bytes_before': before.memory_usage(index=False, deep=True).reindex(columns),
+        'dtype_after': after.dtypes.astype(str).reindex(columns),
+        'bytes_after': after.memory_usage(index=False, deep=True).reindex(columns),
+    })
+    report.loc['Total'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['saved_pct'] = (1 - report['bytes_after'] / report['bytes_before']) * 100
+    return report
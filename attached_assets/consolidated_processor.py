@@ -0,0 +1,129 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from utils.instrumentation import instrumented
+from utils.race_registry import RaceRegistry
+from utils.racing_data_processor import (
+    ROW_KEY_COLUMNS,
+    SALES_PERFORMANCE_COLUMNS,
+    RacingDataProcessor,
+)
+
+REGION_COLUMN = 'region'
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def find_workbooks(source):
+    """Workbook paths from a directory, a glob pattern, a single path or a list of any of these"""
+    if isinstance(source, (list, tuple)):
+        return sorted({path for item in source for path in find_workbooks(item)})
+
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+
+    # Skip Excel's lock files (~$name.xlsx) of workbooks open in Excel
+    return sorted(
+        path for path in paths
+        if path.lower().endswith(WORKBOOK_EXTENSIONS)
+        and not os.path.basename(path).startswith('~$')
+        and os.path.isfile(path)
+    )
+
+
+def available_cpus():
+    """CPUs this process may run on (container/affinity limits included)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def region_name(path):
+    """Region of a workbook: its file name without the extension"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def load_region_sheet(path, region, cache=None):
+    """Sales Performance rows of one regional workbook, tagged with its region (runs in a worker process)"""
+    # The race registry is only needed for processing, which happens on the consolidated frame
+    processor = RacingDataProcessor(path, cache=cache, race_registry=RaceRegistry({}))
+    try:
+        df = processor.load_sales_performance_data()
+    except Exception as e:
+        raise Exception(f"Error loading {path}: {str(e)}")
+    # Columns a region's sheet lacks are added empty, so every region has the same layout
+    df = df.reindex(columns=SALES_PERFORMANCE_COLUMNS)
+    df[REGION_COLUMN] = region
+    return df
+
+
+class ConsolidatedRacingProcessor(RacingDataProcessor):
+    """Racing processor over every regional workbook in a directory or glob.
+
+    Workbooks are parsed in a process pool, largest first, so loading takes
+    about as long as the largest single workbook (given enough cores). Rows
+    are concatenated with a `region` column, which is part of the row key, so
+    the same consultant and supervisor names in two regions stay separate rows
+    and separate teams (team summaries gain a region column). Everything after
+    loading (metrics, ranking, snapshots, incremental refresh) is the
+    single-workbook pipeline.
+    """
+
+    row_key_columns = ROW_KEY_COLUMNS + [REGION_COLUMN]
+
+    def __init__(self, source, max_workers=None, region_of=region_name, cache=None, race_registry=None,
+                 as_of=None, holidays=None, instrumentation=None):
+        super().__init__(str(source), cache, race_registry, as_of, holidays, instrumentation)
+        self.source = source
+        self.max_workers = max_workers
+        self.region_of = region_of
+        self.workbook_paths = []
+
+    @instrumented('load')
+    def load_sales_performance_data(self, on_chunk=None):
+        """Load every regional workbook in parallel (on_chunk receives each region's rows as it finishes)"""
+        paths = find_workbooks(self.source)
+        if not paths:
+            raise Exception(f"Error loading Sales Performance data: no workbooks found in {self.source}")
+
+        # The largest files start first so no big file is left to parse alone at the end
+        paths = sorted(paths, key=os.path.getsize, reverse=True)
+        jobs = [(path, self.region_of(path), self.cache) for path in paths]
+
+        workers = min(len(jobs), self.max_workers or available_cpus())
+        frames = {}
+        if workers == 1:
+            # A pool of one only adds process start-up and pickling
+            for job in jobs:
+                frames[job[0]] = load_region_sheet(*job)
+                if on_chunk is not None:
+                    on_chunk(frames[job[0]])
+        else:
+            # Workers get a copy of the cache; its on-disk entries are written atomically
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(load_region_sheet, *job): job[0] for job in jobs}
+                for future in as_completed(futures):
+                    frames[futures[future]] = future.result()
+                    if on_chunk is not None:
+                        on_chunk(frames[futures[future]])
+
+        # Concatenate in file name order, so the frame doesn't depend on which worker finished first
+        self.workbook_paths = sorted(frames)
+        self.raw_data = pd.concat([frames[path] for path in self.workbook_paths], ignore_index=True)
+        return self.raw_data
+
+    def get_region_summary(self):
+        """Consultants, sales and achievement per region"""
+        df = self.current_snapshot().processed_data
+        regions = df.groupby(REGION_COLUMN, observed=True).agg(
+            consultants=('Consultant Name', 'count'),
+            SalesValTarget=('SalesValTarget', 'sum'),
+            TotalSalesVal=('TotalSalesVal', 'sum'),
+            avg_performance=('overall_performance', 'mean'),
+        )
+        regions['sales_achievement'] = (regions['TotalSalesVal'] / regions['SalesValTarget'] * 100).fillna(0)
+        return regions.reset_index()
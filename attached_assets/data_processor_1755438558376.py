@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import streamlit as st
+from utils.tiers import classify_performance, tier_attribute
 
 class DataProcessor:
     """Handles data processing for the Formula 1 sales dashboard"""
@@ -106,11 +107,10 @@ class DataProcessor:
         # Calculate gap to target
         df['gap_to_target'] = df['target'] - df['current_sales']
         
-        # Add performance categories
-        df['performance_category'] = df['achievement_rate'].apply(self._categorize_performance)
-        
-        # Add vehicle types based on performance
-        df['vehicle_type'] = df['achievement_rate'].apply(self._assign_vehicle)
+        # Add performance categories and vehicle types in a single tier pass
+        tiers = classify_performance(df['achievement_rate'], ['performance_category', 'vehicle_type'])
+        for column, values in tiers.items():
+            df[column] = values
         
         # Add racing position
         df['racing_position'] = df['achievement_rate'].rank(ascending=False, method='min')
@@ -119,29 +119,11 @@ class DataProcessor:
     
     def _categorize_performance(self, achievement_rate):
         """Categorize performance into racing tiers"""
-        if achievement_rate >= 120:
-            return "Superstar"
-        elif achievement_rate >= 100:
-            return "Target Achieved"
-        elif achievement_rate >= 80:
-            return "On Track"
-        elif achievement_rate >= 60:
-            return "Needs Boost"
-        else:
-            return "Recovery Mode"
+        return tier_attribute(achievement_rate, 'performance_category')
     
     def _assign_vehicle(self, achievement_rate):
         """Assign vehicle type based on performance"""
-        if achievement_rate >= 120:
-            return "🏎️"  # Formula 1 car
-        elif achievement_rate >= 100:
-            return "🚗"  # Sports car
-        elif achievement_rate >= 80:
-            return "🚙"  # SUV
-        elif achievement_rate >= 60:
-            return "🚐"  # Van
-        else:
-            return "🛻"  # Truck
+        return tier_attribute(achievement_rate, 'vehicle_type')
     
     def calculate_team_performance(self, df, team_column='team'):
         """Calculate team-based performance metrics"""
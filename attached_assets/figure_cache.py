@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_FIGURES = 32
+
+
+class FigureCache:
+    """Built Plotly figures keyed by (view, race) for one data version.
+
+    A new data version empties the cache; within a version figures are
+    identical for every viewer, so they are built once and shared. Figures
+    are kept unserialized: st.plotly_chart serializes whatever it is given.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_FIGURES):
+        self.max_entries = max_entries
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, view, race, data_version):
+        """Cached figure for a view, or None"""
+        with self._lock:
+            self._sync_version(data_version)
+            entry = self._entries.get((view, race))
+            if entry is not None:
+                self._entries.move_to_end((view, race))
+                self.hits += 1
+            return entry
+
+    def get_or_build(self, view, race, data_version, builder):
+        """Cached figure for a view, building it with `builder()` on a miss"""
+        figure = self.get(view, race, data_version)
+        if figure is not None:
+            return figure
+
+        figure = builder()
+
+        with self._lock:
+            self.misses += 1
+            # Only keep it if the data hasn't moved on while we were building
+            if self._sync_version(data_version):
+                self._entries[(view, race)] = figure
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return figure
+
+    def _sync_version(self, data_version):
+        """Evict everything when the data version bumps; False if `data_version` is stale"""
+        if data_version != self.data_version:
+            if self.data_version is not None and data_version < self.data_version:
+                return False
+            self._entries.clear()
+            self.data_version = data_version
+        return True
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+
+DEFAULT_HISTORY_PATH = '.racing_cache/history.sqlite3'
+
+# Processed-frame column -> history column
+HISTORY_COLUMNS = {
+    'Consultant Name': 'consultant',
+    'Supervisor Name': 'supervisor',
+    'region': 'region',
+    'race': 'race',
+    'SalesValTarget': 'sales_target',
+    'TotalSalesVal': 'sales_actual',
+    'RealAppsTarget': 'apps_target',
+    'TotalRealAppsVol': 'apps_actual',
+    'overall_performance': 'overall_performance',
+    'race_position': 'race_position',
+}
+
+# Row key of a consultant and of a team; region is '' for single-workbook processors
+CONSULTANT_KEY = ['consultant', 'supervisor', 'region']
+TEAM_KEY = ['supervisor', 'region']
+
+# Totals recorded per team alongside the consultant rows, so trends never scan consultants
+TEAM_SUM_COLUMNS = ['sales_target', 'sales_actual', 'apps_target', 'apps_actual']
+
+# Consultant rows are clustered by day, so recording a day only appends to the
+# end of the table; a consultant's history is one primary-key seek per recorded
+# day. Per-team totals are stored per day so team and race trends read one row
+# per day.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot_days (
+    snapshot_date TEXT PRIMARY KEY,
+    consultants INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS consultant_daily (
+    snapshot_date TEXT NOT NULL,
+    consultant TEXT NOT NULL,
+    supervisor TEXT NOT NULL,
+    region TEXT NOT NULL DEFAULT '',
+    race TEXT,
+    sales_target REAL,
+    sales_actual REAL,
+    apps_target REAL,
+    apps_actual REAL,
+    overall_performance REAL,
+    race_position INTEGER,
+    PRIMARY KEY (snapshot_date, consultant, supervisor, region)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS team_daily (
+    supervisor TEXT NOT NULL,
+    region TEXT NOT NULL DEFAULT '',
+    snapshot_date TEXT NOT NULL,
+    race TEXT,
+    sales_target REAL,
+    sales_actual REAL,
+    apps_target REAL,
+    apps_actual REAL,
+    performance_sum REAL,
+    team_size INTEGER,
+    PRIMARY KEY (supervisor, region, snapshot_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_daily_by_race ON team_daily (race, snapshot_date);
+"""
+
+# Per-day totals for a group of teams
+TREND_SELECT = """
+SELECT snapshot_date,
+       SUM(sales_target) AS sales_target, SUM(sales_actual) AS sales_actual,
+       SUM(apps_target) AS apps_target, SUM(apps_actual) AS apps_actual,
+       SUM(performance_sum) / SUM(team_size) AS avg_performance, SUM(team_size) AS team_size
+FROM team_daily
+"""
+
+
+def _iso(day):
+    return day.isoformat() if hasattr(day, 'isoformat') else str(day)
+
+
+class HistoryStore:
+    """Daily history of processed consultant rows in a local SQLite database.
+
+    One row per consultant per day, keyed by date and consultant (with
+    supervisor and region), plus one row per team per day indexed by
+    supervisor and region and by race, so a team or race trend
+    over months reads only one small row per day. Recording a day again
+    replaces that day; other days are never rewritten.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def record(self, processed_data, snapshot_date=None):
+        """Store a processed frame as the snapshot for a day (today by default); returns rows written"""
+        snapshot_date = _iso(snapshot_date or date.today())
+        columns = [col for col in HISTORY_COLUMNS if col in processed_data.columns]
+        frame = processed_data[columns].rename(columns=HISTORY_COLUMNS)
+        if 'region' not in frame.columns:
+            frame.insert(frame.columns.get_loc('supervisor') + 1, 'region', '')
+        for col in ['consultant', 'supervisor', 'region', 'race']:
+            frame[col] = frame[col].astype(object)
+
+        teams = frame.groupby(TEAM_KEY, sort=True).agg(
+            race=('race', 'first'),
+            **{col: (col, 'sum') for col in TEAM_SUM_COLUMNS},
+            performance_sum=('overall_performance', 'sum'),
+            team_size=('consultant', 'count'),
+        ).reset_index()
+
+        # Key order makes the inserts appends to the day's slice of the table
+        frame = frame.sort_values(CONSULTANT_KEY)
+
+        try:
+            with self._lock, self._connection:
+                for table, rows in (('consultant_daily', frame), ('team_daily', teams)):
+                    self._connection.execute(f"DELETE FROM {table} WHERE snapshot_date = ?", (snapshot_date,))
+                    self._insert(table, snapshot_date, rows)
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO snapshot_days (snapshot_date, consultants) VALUES (?, ?)",
+                    (snapshot_date, len(frame))
+                )
+        except Exception as e:
+            raise Exception(f"Error recording history for {snapshot_date}: {str(e)}")
+        return len(frame)
+
+    def _insert(self, table, snapshot_date, frame):
+        # Plain Python values, column by column, instead of converting row by row
+        values = [frame[col].astype(object).where(frame[col].notna(), None).tolist() for col in frame.columns]
+        names = ', '.join(['snapshot_date'] + list(frame.columns))
+        placeholders = ', '.join('?' * (len(frame.columns) + 1))
+        self._connection.executemany(
+            f"INSERT INTO {table} ({names}) VALUES ({placeholders})",
+            ((snapshot_date,) + row for row in zip(*values))
+        )
+
+    def record_snapshot(self, snapshot, snapshot_date=None):
+        """Store a RacingSnapshot's processed frame for a day (the date its pace was measured at by default)"""
+        if snapshot_date is None and snapshot.calendar is not None:
+            snapshot_date = snapshot.calendar.as_of
+        return self.record(snapshot.processed_data, snapshot_date)
+
+    def _query(self, sql, params):
+        with self._lock:
+            return pd.read_sql_query(sql, self._connection, params=params)
+
+    def _date_range(self, start, end):
+        return _iso(start) if start else '0000-00-00', _iso(end) if end else '9999-99-99'
+
+    def dates(self):
+        """Days with a recorded snapshot, oldest first"""
+        return self._query("SELECT snapshot_date FROM snapshot_days ORDER BY snapshot_date", ())[
+            'snapshot_date'].tolist()
+
+    def consultant_history(self, consultant, start=None, end=None):
+        """Daily rows of one consultant between two dates (inclusive)"""
+        return self._query(
+            "SELECT * FROM consultant_daily WHERE consultant = ? AND snapshot_date IN "
+            "(SELECT snapshot_date FROM snapshot_days WHERE snapshot_date BETWEEN ? AND ?) "
+            "ORDER BY snapshot_date",
+            (consultant, *self._date_range(start, end))
+        )
+
+    def team_trend(self, supervisor, start=None, end=None, region=None):
+        """Per-day totals of one supervisor's team (in every region unless one is given),
+        with the sales gained since the previous day"""
+        filters = {'supervisor': supervisor}
+        if region is not None:
+            filters['region'] = region
+        return self._trend(filters, start, end)
+
+    def race_trend(self, race_name, start=None, end=None):
+        """Per-day totals of every team in a race"""
+        return self._trend({'race': race_name}, start, end)
+
+    def _trend(self, filters, start, end):
+        conditions = ''.join(f"{column} = ? AND " for column in filters)
+        trend = self._query(
+            TREND_SELECT + f"WHERE {conditions}snapshot_date BETWEEN ? AND ? "
+            "GROUP BY snapshot_date ORDER BY snapshot_date",
+            (*filters.values(), *self._date_range(start, end))
+        )
+        trend['sales_gained'] = trend['sales_actual'].diff()
+        return trend
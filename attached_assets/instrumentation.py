@@ -0,0 +1,279 @@
+import functools
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+
+# One finished span: wall time, rows produced (None when the result isn't a
+# frame), bytes allocated at peak above the span's start (None unless memory
+# is traced), the error type name when the span raised, and whether the
+# allocation is approximate because another thread traced spans meanwhile
+SpanRecord = namedtuple(
+    'SpanRecord', ['stage', 'seconds', 'rows', 'allocated_bytes', 'error', 'memory_approximate'],
+    defaults=[None]
+)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRIC_PREFIX = 'racing'
+
+
+# tracemalloc's peak is process-wide, so which thread may reset it is tracked
+# across every Instrumentation: threads with traced spans open, and a count of
+# outermost traced spans started (a change during a span means overlap)
+_memory_lock = threading.Lock()
+_memory_local = threading.local()
+_tracing_threads = 0
+_outer_spans_started = 0
+
+
+def _row_count(result):
+    shape = getattr(result, 'shape', None)
+    return int(shape[0]) if shape else None
+
+
+def instrumented(stage):
+    """Method decorator: run the method in a `stage` span of self.instrumentation, counting result rows"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(stage) as span:
+                result = method(self, *args, **kwargs)
+                span.rows = _row_count(result)
+                return result
+        return wrapper
+    return decorate
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class NullInstrumentation:
+    """Instrumentation that records nothing; the default, so spans cost one no-op context manager"""
+
+    enabled = False
+    _span = _NullSpan()
+
+    def span(self, stage, rows=None):
+        return self._span
+
+    def watch_cache(self, name, cache):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class _Span:
+    """A running span; set `rows` inside the block to report how many rows the stage produced"""
+
+    __slots__ = ('instrumentation', 'stage', 'rows', 'start', 'start_bytes', 'peak_bytes', 'spans_started',
+                 'approximate')
+
+    def __init__(self, instrumentation, stage, rows):
+        self.instrumentation = instrumentation
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self):
+        self.instrumentation._enter(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        allocated_bytes = self.instrumentation._exit(self)
+        self.instrumentation.record(SpanRecord(
+            self.stage, seconds, self.rows, allocated_bytes, exc_type.__name__ if exc_type else None,
+            self.approximate if allocated_bytes is not None else None
+        ))
+        return False
+
+
+class StageStats:
+    """Running totals of one stage's spans"""
+
+    __slots__ = ('count', 'errors', 'seconds_sum', 'seconds_max', 'last_seconds', 'last_rows', 'last_allocated_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds_sum = 0.0
+        self.seconds_max = 0.0
+        self.last_seconds = None
+        self.last_rows = None
+        self.last_allocated_bytes = None
+
+    def add(self, record):
+        self.count += 1
+        self.errors += record.error is not None
+        self.seconds_sum += record.seconds
+        self.seconds_max = max(self.seconds_max, record.seconds)
+        self.last_seconds = record.seconds
+        if record.rows is not None:
+            self.last_rows = record.rows
+        # Only exact allocations; approximate ones include other threads' memory
+        if record.allocated_bytes is not None and not record.memory_approximate:
+            self.last_allocated_bytes = record.allocated_bytes
+
+
+class Instrumentation:
+    """Timed spans around processing stages and getters, with per-stage totals and cache counters.
+
+    Every finished span is handed to each sink (any callable taking a
+    SpanRecord, e.g. LogSink) and folded into per-stage totals, which
+    prometheus_text() renders alongside the hit/miss counters of the watched
+    caches. With trace_memory, tracemalloc runs for the process lifetime
+    (slowing allocation-heavy code noticeably) and each span reports its peak
+    allocation; nested spans are accounted correctly. tracemalloc counts the
+    whole process, so a span that overlaps traced spans on another thread
+    reports an upper bound, flagged as memory_approximate.
+    """
+
+    enabled = True
+
+    def __init__(self, sinks=(), trace_memory=False):
+        self.sinks = list(sinks)
+        self.trace_memory = trace_memory
+        self.caches = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Open spans of the current thread, innermost last
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, stage, rows=None):
+        """Context manager timing one run of `stage`"""
+        return _Span(self, stage, rows)
+
+    def watch_cache(self, name, cache):
+        """Export a cache's `hits` and `misses` counters under `name`"""
+        self.caches[name] = cache
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def _stack(self):
+        stack = getattr(self._local, 'spans', None)
+        if stack is None:
+            stack = self._local.spans = []
+        return stack
+
+    def _enter(self, span):
+        if self.trace_memory:
+            global _tracing_threads, _outer_spans_started
+            with _memory_lock:
+                depth = getattr(_memory_local, 'depth', 0)
+                if depth == 0:
+                    _tracing_threads += 1
+                    _outer_spans_started += 1
+                _memory_local.depth = depth + 1
+                span.spans_started = _outer_spans_started
+                # Resetting the peak while another thread's spans are open would hide their peaks
+                span.approximate = _tracing_threads > 1
+                span.start_bytes = tracemalloc.get_traced_memory()[0]
+                span.peak_bytes = span.start_bytes
+                if not span.approximate:
+                    tracemalloc.reset_peak()
+        self._stack().append(span)
+
+    def _exit(self, span):
+        stack = self._stack()
+        stack.pop()
+        if not self.trace_memory:
+            return None
+        global _tracing_threads
+        with _memory_lock:
+            # Another thread started tracing while this span was open
+            span.approximate = span.approximate or _outer_spans_started != span.spans_started
+            # reset_peak() in a nested span hides earlier peaks from this one, so
+            # every span passes the highest peak it saw up to its parent
+            span.peak_bytes = max(span.peak_bytes, tracemalloc.get_traced_memory()[1])
+            _memory_local.depth -= 1
+            if _memory_local.depth == 0:
+                _tracing_threads -= 1
+        if stack:
+            stack[-1].peak_bytes = max(stack[-1].peak_bytes, span.peak_bytes)
+            stack[-1].approximate = stack[-1].approximate or span.approximate
+        return span.peak_bytes - span.start_bytes
+
+    def record(self, record):
+        """Fold a finished span into the stage totals and pass it to every sink"""
+        with self._lock:
+            stats = self._stats.get(record.stage)
+            if stats is None:
+                stats = self._stats[record.stage] = StageStats()
+            stats.add(record)
+        for sink in self.sinks:
+            sink(record)
+
+    def stage_stats(self):
+        """Stage name -> StageStats, in first-seen order"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def prometheus_text(self):
+        """Stage totals and cache counters in the Prometheus text exposition format"""
+        stats = self.stage_stats()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                return
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}_{name}{labels} {value}")
+
+        def stage_samples(attribute):
+            return [(_labels(stage=stage), getattr(s, attribute)) for stage, s in stats.items()]
+
+        metric('stage_runs_total', 'counter', "Completed runs of each processing stage or getter",
+               stage_samples('count'))
+        metric('stage_errors_total', 'counter', "Runs of each stage that raised", stage_samples('errors'))
+        metric('stage_seconds_total', 'counter', "Wall time spent in each stage", stage_samples('seconds_sum'))
+        metric('stage_seconds_max', 'gauge', "Slowest run of each stage", stage_samples('seconds_max'))
+        metric('stage_last_seconds', 'gauge', "Wall time of each stage's latest run", stage_samples('last_seconds'))
+        metric('stage_last_rows', 'gauge', "Rows produced by each stage's latest run", stage_samples('last_rows'))
+        metric('stage_last_allocated_bytes', 'gauge', "Peak bytes allocated by each stage's latest run",
+               stage_samples('last_allocated_bytes'))
+
+        caches = list(self.caches.items())
+        metric('cache_hits_total', 'counter', "Cache lookups served from the cache",
+               [(_labels(cache=name), getattr(cache, 'hits', None)) for name, cache in caches])
+        metric('cache_misses_total', 'counter', "Cache lookups that had to build the value",
+               [(_labels(cache=name), getattr(cache, 'misses', None)) for name, cache in caches])
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class LogSink:
+    """Sink writing each span as one JSON log line"""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self.logger = logger or logging.getLogger('racing.instrumentation')
+        self.level = level
+
+    def __call__(self, record):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, json.dumps({'event': 'span', **record._asdict()}))
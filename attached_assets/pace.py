@@ -0,0 +1,140 @@
+from collections import namedtuple
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# South African public holidays on fixed dates (Public Holidays Act 36 of 1994), as (month, day)
+FIXED_PUBLIC_HOLIDAYS = [
+    (1, 1),    # New Year's Day
+    (3, 21),   # Human Rights Day
+    (4, 27),   # Freedom Day
+    (5, 1),    # Workers' Day
+    (6, 16),   # Youth Day
+    (8, 9),    # National Women's Day
+    (9, 24),   # Heritage Day
+    (12, 16),  # Day of Reconciliation
+    (12, 25),  # Christmas Day
+    (12, 26),  # Day of Goodwill
+]
+
+PACE_COLUMNS = [
+    'daily_target', 'daily_achievement', 'expected_to_date', 'pace',
+    'laps_completed', 'current_lap_progress', 'projected_finish', 'projected_achievement'
+]
+
+# Business days in the snapshot's month, and how many of them have been worked by the snapshot date
+MonthCalendar = namedtuple('MonthCalendar', ['as_of', 'month_start', 'business_days', 'elapsed_days'])
+
+
+def easter_sunday(year):
+    """Date of (Western) Easter Sunday, by the anonymous Gregorian algorithm"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def public_holidays(year):
+    """South African public holidays of a year, sorted.
+
+    Good Friday and Family Day (Easter Monday) move with Easter. A holiday
+    on a Sunday is observed on the Monday after, or the next day that isn't
+    already a holiday (Christmas on a Sunday makes the 27th a holiday).
+    """
+    easter = easter_sunday(year)
+    days = {date(year, month, day) for month, day in FIXED_PUBLIC_HOLIDAYS}
+    days.update([easter - timedelta(days=2), easter + timedelta(days=1)])
+
+    for day in sorted(days):
+        if day.weekday() == 6:
+            observed = day + timedelta(days=1)
+            while observed in days:
+                observed += timedelta(days=1)
+            days.add(observed)
+    return sorted(days)
+
+
+def report_month_start(values):
+    """First day of the month most rows report (ReportMonth values like 202508); None when no row has one"""
+    months = pd.to_numeric(pd.Series(values), errors='coerce').dropna()
+    months = months[(months % 1 == 0) & (months % 100 >= 1) & (months % 100 <= 12)]
+    if months.empty:
+        return None
+    month = int(months.mode().iloc[0])
+    return date(month // 100, month % 100, 1)
+
+
+def month_as_of(month_start, today=None):
+    """Snapshot date for a report month: today while the month is current, its last day once it's over"""
+    today = today or date.today()
+    if month_start is None or (month_start.year, month_start.month) == (today.year, today.month):
+        return today
+    if month_start > today:
+        return month_start
+    return (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def month_calendar(as_of=None, holidays=None):
+    """Business-day calendar of the month containing `as_of` (today by default).
+
+    `as_of` may be a date, datetime, Timestamp or date string; `holidays` are
+    the dates skipped besides weekends (South African public holidays when None).
+    """
+    as_of = date.today() if as_of is None else pd.Timestamp(as_of).date()
+    month_start = as_of.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    if holidays is None:
+        holidays = public_holidays(as_of.year)
+    holidays = np.array([pd.Timestamp(day).date() for day in holidays], dtype='datetime64[D]')
+
+    business_days = int(np.busday_count(month_start, next_month, holidays=holidays))
+    # The snapshot date itself counts as worked
+    elapsed_days = int(np.busday_count(month_start, as_of + timedelta(days=1), holidays=holidays))
+    return MonthCalendar(as_of, month_start, business_days, elapsed_days)
+
+
+def _ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def compute_pace(target, actual, calendar=None):
+    """Pace of many rows (teams or consultants) against a month's business-day calendar.
+
+    Every lap is one business day's worth of target, so a team exactly on pace
+    has completed as many laps as business days have elapsed. Returns a frame
+    aligned with `target`:
+
+    - daily_target / daily_achievement: target per business day, actual per elapsed business day
+    - expected_to_date: target a team on pace would have reached by the snapshot date
+    - pace: actual / expected_to_date (1.0 = on pace)
+    - laps_completed / current_lap_progress: whole and fractional laps
+    - projected_finish / projected_achievement: month-end actual at the current run rate, and % of target
+    """
+    calendar = calendar or month_calendar()
+    index = target.index if isinstance(target, pd.Series) else None
+    target = np.asarray(target, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+
+    daily_target = target / calendar.business_days if calendar.business_days else np.zeros(len(target))
+    daily_achievement = actual / calendar.elapsed_days if calendar.elapsed_days else np.zeros(len(actual))
+    expected_to_date = daily_target * calendar.elapsed_days
+    laps_completed = _ratio(actual, daily_target)
+    projected_finish = daily_achievement * calendar.business_days
+
+    return pd.DataFrame({
+        'daily_target': daily_target,
+        'daily_achievement': daily_achievement,
+        'expected_to_date': expected_to_date,
+        'pace': _ratio(actual, expected_to_date),
+        'laps_completed': laps_completed,
+        'current_lap_progress': laps_completed - np.trunc(laps_completed),
+        'projected_finish': projected_finish,
+        'projected_achievement': _ratio(projected_finish, target) * 100,
+    }, index=index)
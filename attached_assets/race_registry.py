@@ -0,0 +1,47 @@
+import json
+import os
+
+import pandas as pd
+
+DEFAULT_RACES_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'races.json')
+
+
+class RaceRegistry:
+    """Races (regional leagues) and the supervisors entered in each"""
+
+    def __init__(self, races):
+        # Keep config order for race names; team lists are shown alphabetically
+        self.races = {name: sorted(supervisors) for name, supervisors in races.items()}
+        self.supervisor_race = {}
+        for name, supervisors in self.races.items():
+            for supervisor in supervisors:
+                if supervisor in self.supervisor_race:
+                    raise ValueError(
+                        f"Supervisor '{supervisor}' is entered in both "
+                        f"{self.supervisor_race[supervisor]} and {name}"
+                    )
+                self.supervisor_race[supervisor] = name
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RACES_CONFIG):
+        """Load a registry from a JSON config of the form {"races": {name: [supervisors]}}"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                config = json.load(f)
+        except Exception as e:
+            raise Exception(f"Error loading race config {path}: {str(e)}")
+        return cls(config.get('races', {}))
+
+    def race_names(self):
+        """Race names in config order"""
+        return list(self.races)
+
+    def teams(self, race_name):
+        """Supervisors entered in a race"""
+        return self.races.get(race_name, [])
+
+    def assign(self, supervisor_names):
+        """Vectorized supervisor -> race lookup as a categorical (NaN when not entered)"""
+        races = pd.Series(supervisor_names).map(self.supervisor_race)
+        return pd.Categorical(races, categories=self.race_names())
+
@@ -1,65 +1,419 @@
+import threading
+from collections import namedtuple
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from utils.aggregates import TEAM_KEY_COLUMNS, AggregationCube
+from utils.compaction import compact_frame, memory_report, uncompacted
+from utils.instrumentation import NULL_INSTRUMENTATION, instrumented
+from utils.pace import month_as_of, month_calendar, report_month_start
+from utils.race_registry import RaceRegistry
+from utils.ranking import insert_positions, key_ranks, performance_order, rank_positions
+from utils.tiers import classify_performance, tier_attribute
+from utils.workbook_cache import WorkbookCache
+from utils.workbook_reader import read_sheet
+
+SALES_PERFORMANCE_SHEET = 'Sales Perfromance'  # Note: typo in sheet name
+
+# A consultant row is identified by consultant and supervisor name
+ROW_KEY_COLUMNS = ['Consultant Name', 'Supervisor Name']
+
+NUMERIC_COLUMNS = [
+    'RealAppsTarget', 'TotalRealAppsVol', 'Real Apps % to Target',
+    'SalesValTarget', 'TotalSalesVal', 'Sales Val % to Target',
+    'LoanDealsVol', 'LoanSaleVal', 'CardDealsVol', 'CardSaleVal',
+    'CreditCardDealTarget', 'Creditcard  % to target'
+]
+
+# Month the sheet reports on (202508); pace is measured against this month's calendar
+REPORT_MONTH_COLUMN = 'ReportMonth'
+
+# Only these columns are read from the workbook
+SALES_PERFORMANCE_COLUMNS = [REPORT_MONTH_COLUMN] + ROW_KEY_COLUMNS + NUMERIC_COLUMNS
+
+# Above this share of changed rows a full run is cheaper than patching them in
+MAX_INCREMENTAL_SHARE = 0.2
+
+# Where a snapshot's rows came from: the cleaned sheet's row keys and each row's
+# rank in key order (both in sheet order), and the sheet position of each
+# processed row (in rank order)
+SourceRows = namedtuple('SourceRows', ['keys', 'key_ranks', 'positions'])
+
+LEADERBOARD_COLUMNS = [
+    'Consultant Name', 'Supervisor Name', 'overall_performance',
+    'vehicle_type', 'performance_color', 'race_position',
+    'track_position', 'TotalSalesVal', 'SalesValTarget',
+    'lap_progress', 'completed_laps', 'current_lap_progress'
+]
+
+def same_values(new, old):
+    """Element-wise equality of two aligned arrays (NaN equals NaN)"""
+    return (new == old) | (pd.isna(new) & pd.isna(old))
+
+class RacingSnapshot:
+    """One fully processed version of the racing data, never modified once published.
+
+    Holds the processed frame (in rank order), the sheet rows it came from
+    (see SourceRows), the row positions of each race and the aggregation cube (with team pace for the snapshot
+    date's business-day calendar), so every read from one snapshot is
+    consistent no matter how many refreshes happen meanwhile.
+    """
+    
+    def __init__(self, version, processed_data, source, race_registry, calendar=None, instrumentation=None,
+                 team_columns=TEAM_KEY_COLUMNS):
+        self.version = version
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.processed_data = processed_data
+        # SourceRows matching processed rows up with a refreshed sheet (None: refreshes run in full)
+        self.source = source
+        self.race_registry = race_registry
+        self.calendar = calendar or month_calendar()
+        # Row positions (in performance order) of each race
+        self.race_rows = processed_data.groupby('race', observed=True, sort=False).indices
+        # Team/race/company totals
+        self.aggregates = AggregationCube(processed_data, self.calendar, team_columns)
+    
+    def get_race_rows(self, race_name):
+        """Row positions (in performance order) for a race; all rows for an unknown race"""
+        if race_name not in self.race_registry.races:
+            return np.arange(len(self.processed_data))
+        return self.race_rows.get(race_name, np.array([], dtype=np.intp))
+    
+    @instrumented('team_summary')
+    def get_team_summary(self):
+        """Get team-level summary for gauge view"""
+        # Sorted alphabetically by team name
+        return self.aggregates.team_summary()
+    
+    @instrumented('company_metrics')
+    def get_total_company_metrics(self):
+        """Get company-wide metrics for total gauge"""
+        return self.aggregates.company_metrics()
+    
+    @instrumented('leaderboard')
+    def get_racing_leaderboard(self, top_n=10, rank_method='ordinal'):
+        """Get top performers for racing view (rank_method: ordinal, min or dense)"""
+        # processed_data is kept in rank order, so the leaders are its first rows
+        df = self.processed_data.head(top_n)[LEADERBOARD_COLUMNS]
+        
+        if rank_method != 'ordinal':
+            df['race_position'] = rank_positions(df['overall_performance'], rank_method)
+        
+        return df
+    
+    @instrumented('leaderboard_by_race')
+    def get_racing_leaderboard_by_race(self, race_name='Monaco', top_n=10, rank_method='ordinal'):
+        """Get top performers filtered by race (rank_method: ordinal, min or dense)"""
+        rows = self.get_race_rows(race_name)
+        
+        # Race rows are in performance order, so a race's first rows are its leaders
+        df = self.processed_data.take(rows[:top_n])[LEADERBOARD_COLUMNS].reset_index(drop=True)
+        
+        # Re-rank within the race and update track positions relative to the race leader
+        df['race_position'] = rank_positions(df['overall_performance'], rank_method)
+        if not df.empty:
+            max_performance = df['overall_performance'].iloc[0]
+            df['track_position'] = (df['overall_performance'] / max_performance) * 100
+        
+        return df
+    
+    def get_race_teams_split(self):
+        """Get teams split between races"""
+        return {
+            race_name: self.race_registry.teams(race_name)
+            for race_name in self.race_registry.race_names()
+        }
+    
+    @instrumented('team_summary_by_race')
+    def get_team_summary_by_race(self, race_name='Monaco'):
+        """Get team-level summary filtered by race"""
+        # An unknown race covers every team
+        if race_name not in self.race_registry.races:
+            race_name = None
+        
+        # Sorted by team achievement
+        return self.aggregates.team_summary(race_name, sort_by='team_sales_achievement')
 
 class RacingDataProcessor:
-    """Specialized data processor for racing gamification dashboard"""
+    """Specialized data processor for racing gamification dashboard.
+
+    Each processing run publishes a new RacingSnapshot by swapping a single
+    reference, so readers on other threads never see a half-built frame and
+    never need a lock; refreshes are serialized among themselves.
+    """
     
-    def __init__(self, excel_file_path):
+    # Columns identifying a consultant row (subclasses merging several sheets add their own)
+    row_key_columns = ROW_KEY_COLUMNS
+    
+    def __init__(self, excel_file_path, cache=None, race_registry=None, as_of=None, holidays=None,
+                 instrumentation=None):
         self.excel_file_path = excel_file_path
         self.raw_data = None
-        self.processed_data = None
+        # Snapshot date for pace (from the workbook's report month when None, see snapshot_date)
+        # and non-working days besides weekends (South African public holidays when None)
+        self.as_of = as_of
+        self.holidays = holidays
+        # First day of the month the processed sheet reports on (None when it has no ReportMonth)
+        self.report_month = None
+        # Supervisor -> race assignments
+        self.race_registry = RaceRegistry.from_file() if race_registry is None else race_registry
+        # The current RacingSnapshot; replaced, never modified, by each processing run
+        self.snapshot = None
+        # Columnar cache of the parsed sheet; pass cache=False to always parse the xlsx
+        self.cache = WorkbookCache() if cache is None else cache
+        # Spans around each stage and getter (see utils.instrumentation); records nothing by default
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        if self.cache:
+            self.instrumentation.watch_cache('workbook', self.cache)
+        self._process_lock = threading.RLock()
+    
+    # Read-only views of the current snapshot, for callers that predate snapshots
+    @property
+    def processed_data(self):
+        snapshot = self.snapshot
+        return snapshot.processed_data if snapshot is not None else None
+    
+    @property
+    def data_version(self):
+        snapshot = self.snapshot
+        return snapshot.version if snapshot is not None else 0
+    
+    def current_snapshot(self, on_chunk=None):
+        """The published snapshot, loading and processing the workbook first if nothing has been published yet.
+
+        on_chunk receives rows as they stream in, only when this call is the one that reads the workbook.
+        A snapshot published on an earlier day is republished with the current pace calendar.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.calendar.as_of != self.snapshot_date():
+            with self._process_lock:
+                if self.snapshot is None:
+                    if self.raw_data is None:
+                        self.load_sales_performance_data(on_chunk=on_chunk)
+                    self.process_for_racing_dashboard()
+                elif self.snapshot.calendar.as_of != self.snapshot_date():
+                    # Same rows; only the business days elapsed (and so the pace) moved on
+                    self.publish(self.snapshot.processed_data, self.snapshot.source)
+                snapshot = self.snapshot
+        return snapshot
+    
+    def snapshot_date(self):
+        """Date pace is measured at: as_of when given, else today while the report month is current
+        and the month's last day once it is over"""
+        if self.as_of is not None:
+            return pd.Timestamp(self.as_of).date()
+        return month_as_of(self.report_month)
+    
+    @instrumented('snapshot')
+    def publish(self, df, source):
+        """Publish a processed frame and the SourceRows it came from as the next snapshot"""
+        if REPORT_MONTH_COLUMN in df.columns:
+            self.report_month = report_month_start(df[REPORT_MONTH_COLUMN])
+        calendar = month_calendar(self.snapshot_date(), self.holidays)
+        # A team is every row key column but the consultant's own
+        team_columns = [col for col in self.row_key_columns if col != 'Consultant Name']
+        self.snapshot = RacingSnapshot(
+            self.data_version + 1, df, source, self.race_registry, calendar, self.instrumentation, team_columns
+        )
+        return df
         
-    def load_sales_performance_data(self):
-        """Load and process the Sales Performance sheet"""
+    @instrumented('load')
+    def load_sales_performance_data(self, on_chunk=None):
+        """Load and process the Sales Performance sheet (on_chunk receives rows as they stream in)"""
         try:
-            # Read the Sales Performance sheet
-            self.raw_data = pd.read_excel(self.excel_file_path, sheet_name='Sales Perfromance')
+            # Read the Sales Performance sheet (from the columnar cache when the workbook is unchanged)
+            def parse_sheet():
+                return read_sheet(
+                    self.excel_file_path, SALES_PERFORMANCE_SHEET,
+                    columns=SALES_PERFORMANCE_COLUMNS,
+                    numeric_columns=NUMERIC_COLUMNS,
+                    on_chunk=on_chunk
+                )
+            
+            if self.cache:
+                self.raw_data = self.cache.load(
+                    self.excel_file_path, SALES_PERFORMANCE_SHEET, parse_sheet,
+                    columns=SALES_PERFORMANCE_COLUMNS
+                )
+            else:
+                self.raw_data = parse_sheet()
             return self.raw_data
         except Exception as e:
             raise Exception(f"Error loading Sales Performance data: {str(e)}")
     
-    def process_for_racing_dashboard(self):
+    @instrumented('process')
+    def process_for_racing_dashboard(self, incremental=False):
         """Process data specifically for racing dashboard views"""
+        with self._process_lock:
+            if incremental and self.snapshot is not None:
+                return self.process_changed_rows()
+            
+            if self.raw_data is None:
+                self.load_sales_performance_data()
+            
+            # Clean and standardize the data (raw_data itself is left untouched)
+            df = self.clean_data(self.raw_data).reset_index(drop=True)
+            keys = df[self.row_key_columns]
+            ranks = key_ranks(keys)
+            
+            # Compact dtypes: int32 counts, categorical labels
+            with self.instrumentation.span('compact', len(df)):
+                df = compact_frame(df)
+            
+            # Calculate racing metrics
+            df = self.calculate_racing_metrics(df)
+            
+            # Rank order: best overall performance first, ties broken by the row key
+            order = performance_order(df['overall_performance'], ranks)
+            df = df.take(order)
+            source = SourceRows(keys, ranks, order)
+            
+            # Add racing positions and lap information
+            df = self.add_racing_positions(df, presorted=True)
+            
+            # Tag each row with its race
+            df = self.assign_races(df)
+            
+            return self.publish(df, source)
+    
+    def refresh(self, incremental=True):
+        """Reload the workbook and re-process it (only changed rows when incremental)"""
+        with self._process_lock:
+            self.load_sales_performance_data()
+            return self.process_for_racing_dashboard(incremental=incremental)
+    
+    @instrumented('process_incremental')
+    def process_changed_rows(self):
+        """Diff the loaded sheet against the processed frame and re-process only changed rows"""
+        with self._process_lock:
+            return self._process_changed_rows(self.snapshot)
+    
+    def _process_changed_rows(self, snapshot):
+        previous = snapshot.processed_data
         if self.raw_data is None:
             self.load_sales_performance_data()
         
-        df = self.raw_data.copy()
-        
-        # Clean and standardize the data
-        df = self.clean_data(df)
-        
-        # Calculate racing metrics
-        df = self.calculate_racing_metrics(df)
-        
-        # Add racing positions and lap information
-        df = self.add_racing_positions(df)
-        
-        self.processed_data = df
-        return df
+        df = self.clean_data(self.raw_data).reset_index(drop=True)
+        
+        # Rows are matched up by position: a refresh patches the previous frame in place
+        # when the sheet still lists the same consultants in the same order. Anything
+        # else (joiners, leavers, re-sorted sheets, new columns) is a full run.
+        key_columns = self.row_key_columns
+        value_columns = [col for col in df.columns if col not in key_columns]
+        source = snapshot.source
+        if (source is None
+                or not set(value_columns).issubset(previous.columns)
+                or df.empty
+                or not df[key_columns].equals(source.keys)):
+            return self.process_for_racing_dashboard()
+        
+        with self.instrumentation.span('diff', len(df)) as span:
+            # Sheet values in the previous rank order, so both sides line up row for row
+            unchanged = np.ones(len(df), dtype=bool)
+            for col in value_columns:
+                unchanged &= same_values(df[col].to_numpy()[source.positions], previous[col].to_numpy())
+            # Positions (in the previous rank order) of rows that need re-processing
+            changed = np.flatnonzero(~unchanged)
+            span.rows = len(changed)
+        
+        if len(changed) == 0:
+            return previous
+        if len(changed) > len(df) * MAX_INCREMENTAL_SHARE:
+            return self.process_for_racing_dashboard()
+        
+        # Recompute metrics for the changed rows only, in their new rank order
+        recomputed = self.calculate_racing_metrics(df.take(source.positions[changed]))
+        kept = np.delete(np.arange(len(previous)), changed)
+        ranks = source.key_ranks[source.positions]
+        by_rank = performance_order(recomputed['overall_performance'], ranks[changed])
+        recomputed = recomputed.take(by_rank)
+        moved = changed[by_rank]
+        
+        # Re-insert the changed rows among the unchanged ones (still in rank order)
+        insert_at = insert_positions(
+            previous['overall_performance'].to_numpy()[kept], ranks[kept],
+            recomputed['overall_performance'].to_numpy(), ranks[moved]
+        )
+        order = np.insert(kept, insert_at, moved)
+        
+        # Unchanged rows move to their new positions; changed rows also take their recomputed values.
+        # insert_at is non-decreasing, so the i-th changed row lands at insert_at[i] + i
+        targets = insert_at + np.arange(len(moved))
+        columns = {}
+        for col in previous.columns:
+            values = recomputed[col] if col in recomputed.columns and col not in key_columns else None
+            columns[col] = self.patch_column(previous[col], order, targets, values)
+            # A value the compacted column can't hold exactly (a fractional count,
+            # a new category) changes its dtype: a full run compacts it afresh
+            if columns[col] is None:
+                return self.process_for_racing_dashboard()
+        df = pd.DataFrame(columns, copy=False)
+        
+        # Positions and laps are recomputed for every row; races follow supervisors, which are unchanged
+        df = self.add_racing_positions(df, presorted=True)
+        
+        return self.publish(df, source._replace(positions=source.positions[order]))
+    
+    @staticmethod
+    def patch_column(column, order, targets, values=None):
+        """A processed column's values in `order`, with `values` (if given) written at the `targets`
+        positions; None when the column's dtype can't hold them exactly"""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()[order]
+            if values is not None:
+                new_codes = column.cat.categories.get_indexer(np.asarray(values, dtype=object))
+                if ((new_codes < 0) & values.notna().to_numpy()).any():
+                    return None
+                codes[targets] = new_codes
+            return pd.Categorical.from_codes(codes, dtype=column.dtype)
+        
+        if values is None:
+            return column.array.take(order)
+        patched = column.to_numpy()[order]
+        values = values.to_numpy()
+        try:
+            with np.errstate(invalid='ignore'):
+                cast = values.astype(patched.dtype)
+        except (TypeError, ValueError):
+            return None
+        if not same_values(cast, values).all():
+            return None
+        patched[targets] = cast
+        return patched
+    
+    def memory_report(self):
+        """Bytes per column of the processed frame, without vs. with dtype compaction"""
+        processed = self.current_snapshot().processed_data
+        return memory_report(uncompacted(processed), processed)
     
+    @instrumented('clean')
     def clean_data(self, df):
         """Clean and standardize the sales data"""
-        # Remove rows with missing consultant names
-        df = df.dropna(subset=['Consultant Name'])
+        # Remove rows with missing consultant names. take() builds a frame of its own (a boolean
+        # mask would give a slice of the caller's), so the columns set below never touch the input
+        df = df.take(np.flatnonzero(df['Consultant Name'].notna()))
         
         # Fill missing supervisor names
         df['Supervisor Name'] = df['Supervisor Name'].fillna('Unassigned')
         
-        # Ensure numeric columns are properly formatted
-        numeric_columns = [
-            'RealAppsTarget', 'TotalRealAppsVol', 'Real Apps % to Target',
-            'SalesValTarget', 'TotalSalesVal', 'Sales Val % to Target',
-            'LoanDealsVol', 'LoanSaleVal', 'CardDealsVol', 'CardSaleVal',
-            'CreditCardDealTarget', 'Creditcard  % to target'
-        ]
+        # Report month as a number (202508), whether read from the workbook or its cached text
+        if REPORT_MONTH_COLUMN in df.columns and not pd.api.types.is_numeric_dtype(df[REPORT_MONTH_COLUMN]):
+            df[REPORT_MONTH_COLUMN] = pd.to_numeric(df[REPORT_MONTH_COLUMN], errors='coerce')
         
-        for col in numeric_columns:
+        # Ensure numeric columns are properly formatted (columns that already are stay shared with the input)
+        for col in NUMERIC_COLUMNS:
             if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+                values = df[col]
+                if not pd.api.types.is_numeric_dtype(values):
+                    values = pd.to_numeric(values, errors='coerce')
+                if values.hasnans:
+                    values = values.fillna(0)
+                if values is not df[col]:
+                    df[col] = values
         
         return df
     
+    @instrumented('metrics')
     def calculate_racing_metrics(self, df):
         """Calculate metrics needed for racing dashboard"""
         # Primary achievement rate (Sales Value)
@@ -74,44 +428,36 @@ class RacingDataProcessor:
         # Racing speed calculation (for vehicle movement)
         df['racing_speed'] = np.clip(df['overall_performance'] / 100, 0, 1.5)  # Cap at 150%
         
-        # Performance category for vehicle type
-        df['vehicle_type'] = df['overall_performance'].apply(self.get_vehicle_type)
-        
-        # Performance color
-        df['performance_color'] = df['overall_performance'].apply(self.get_performance_color)
+        # Vehicle type and color from the performance tier, as categorical columns
+        tiers = classify_performance(df['overall_performance'], ['vehicle_type', 'performance_color'])
+        for column, values in tiers.items():
+            df[column] = values
         
         return df
     
     def get_vehicle_type(self, performance):
         """Assign vehicle type based on performance"""
-        if performance >= 120:
-            return "🏎️"  # Formula 1 car - top performers
-        elif performance >= 100:
-            return "🚗"   # Sports car - target achievers
-        elif performance >= 80:
-            return "🚙"   # SUV - on track
-        elif performance >= 60:
-            return "🚐"   # Van - needs boost
-        else:
-            return "🛻"   # Truck - recovery mode
+        return tier_attribute(performance, 'vehicle_type')
     
     def get_performance_color(self, performance):
         """Get color based on performance level"""
-        if performance >= 120:
-            return "#FF6B35"  # Orange-red for superstars
-        elif performance >= 100:
-            return "#4ECDC4"  # Teal for target achieved
-        elif performance >= 80:
-            return "#45B7D1"  # Blue for on track
-        elif performance >= 60:
-            return "#FFA07A"  # Light salmon for needs boost
-        else:
-            return "#FF6B6B"  # Red for recovery mode
-    
-    def add_racing_positions(self, df):
+        return tier_attribute(performance, 'performance_color')
+    
+    def sort_by_performance(self, df):
+        """Rows in rank order: best overall performance first, ties broken by the row key"""
+        return df.sort_values(
+            ['overall_performance'] + self.row_key_columns,
+            ascending=[False] + [True] * len(self.row_key_columns),
+            kind='mergesort'
+        )
+    
+    @instrumented('positions')
+    def add_racing_positions(self, df, presorted=False):
         """Add racing positions and lap information"""
-        # Sort by overall performance
-        df = df.sort_values('overall_performance', ascending=False).reset_index(drop=True)
+        # Sort by overall performance (ties broken by name, so refreshes can re-insert rows exactly)
+        if not presorted:
+            df = self.sort_by_performance(df)
+        df = df.reset_index(drop=True)
         
         # Add race positions
         df['race_position'] = range(1, len(df) + 1)
@@ -127,196 +473,41 @@ class RacingDataProcessor:
         
         return df
     
+    @instrumented('assign_races')
+    def assign_races(self, df):
+        """Add a categorical race column"""
+        df['race'] = self.race_registry.assign(df['Supervisor Name'])
+        return df
+    
+    # Getters read one snapshot, so each call sees a single consistent version of the data
+    def get_race_rows(self, race_name):
+        """Row positions (in performance order) for a race; all rows for an unknown race"""
+        return self.current_snapshot().get_race_rows(race_name)
+    
+    def get_aggregates(self):
+        """Aggregation cube for the current processed data"""
+        return self.current_snapshot().aggregates
+    
     def get_team_summary(self):
         """Get team-level summary for gauge view"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data
-        
-        # Group by supervisor (team)
-        team_summary = df.groupby('Supervisor Name').agg({
-            'SalesValTarget': 'sum',
-            'TotalSalesVal': 'sum',
-            'RealAppsTarget': 'sum',
-            'TotalRealAppsVol': 'sum',
-            'overall_performance': 'mean',
-            'Consultant Name': 'count'
-        }).reset_index()
-        
-        # Calculate team achievement rates
-        team_summary['team_sales_achievement'] = (
-            team_summary['TotalSalesVal'] / team_summary['SalesValTarget'] * 100
-        ).fillna(0)
-        
-        team_summary['team_apps_achievement'] = (
-            team_summary['TotalRealAppsVol'] / team_summary['RealAppsTarget'] * 100
-        ).fillna(0)
-        
-        # Rename columns for clarity
-        team_summary = team_summary.rename(columns={
-            'Supervisor Name': 'team_name',
-            'Consultant Name': 'team_size',
-            'overall_performance': 'avg_performance'
-        })
-        
-        # Sort alphabetically by team name
-        team_summary = team_summary.sort_values('team_name')
-        
-        return team_summary
+        return self.current_snapshot().get_team_summary()
     
     def get_total_company_metrics(self):
         """Get company-wide metrics for total gauge"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data
-        
-        total_metrics = {
-            'total_sales_target': df['SalesValTarget'].sum(),
-            'total_sales_actual': df['TotalSalesVal'].sum(),
-            'total_apps_target': df['RealAppsTarget'].sum(),
-            'total_apps_actual': df['TotalRealAppsVol'].sum(),
-            'overall_sales_achievement': (df['TotalSalesVal'].sum() / df['SalesValTarget'].sum() * 100) if df['SalesValTarget'].sum() > 0 else 0,
-            'overall_apps_achievement': (df['TotalRealAppsVol'].sum() / df['RealAppsTarget'].sum() * 100) if df['RealAppsTarget'].sum() > 0 else 0,
-            'avg_individual_performance': df['overall_performance'].mean(),
-            'total_consultants': len(df),
-            'top_performer': df.loc[df['overall_performance'].idxmax(), 'Consultant Name'] if not df.empty else 'N/A'
-        }
-        
-        return total_metrics
+        return self.current_snapshot().get_total_company_metrics()
     
-    def get_racing_leaderboard(self, top_n=10):
-        """Get top performers for racing view"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data.head(top_n)
-        
-        return df[['Consultant Name', 'Supervisor Name', 'overall_performance', 
-                  'vehicle_type', 'performance_color', 'race_position', 
-                  'track_position', 'TotalSalesVal', 'SalesValTarget',
-                  'lap_progress', 'completed_laps', 'current_lap_progress']].copy()
-    
-    def get_racing_leaderboard_by_race(self, race_name='Monaco', top_n=10):
-        """Get top performers filtered by race (Monaco or Kyalami)"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data.copy()
-        
-        # Filter by race based on actual supervisor assignments
-        monaco_supervisors = [
-            'Ashley Moyo', 'Mixo Makhubele', 'Nonhle Zondi', 'Rodney Naidu',
-            'Samantha Govender', 'Samuel Masubelele', 'Taedi Moletsane', 
-            'Thabo Mosweu', 'Thobile Phakhathi'
-        ]
-        
-        kyalami_supervisors = [
-            'Busisiwe Mabuza', 'Cindy Visser', 'Matimba Ngobeni', 'Mfundo Mdlalose',
-            'Mondli Nhlapho', 'Mosima Moshidi', 'Salome Baloyi', 'Shadleigh White', 'Tshepo Moeketsi'
-        ]
-        
-        if race_name == 'Monaco':
-            df = df[df['Supervisor Name'].isin(monaco_supervisors)]
-        elif race_name == 'Kyalami':
-            df = df[df['Supervisor Name'].isin(kyalami_supervisors)]
-        
-        # Re-rank within the race
-        df = df.sort_values('overall_performance', ascending=False).reset_index(drop=True)
-        df['race_position'] = range(1, len(df) + 1)
-        
-        # Update track positions relative to race leaders
-        if not df.empty:
-            max_performance = df['overall_performance'].max()
-            df['track_position'] = (df['overall_performance'] / max_performance) * 100
-        
-        # Add lap progress data for course map
-        df['lap_progress'] = df['overall_performance'] / 100
-        df['completed_laps'] = np.floor(df['lap_progress'])
-        df['current_lap_progress'] = df['lap_progress'] - df['completed_laps']
-        
-        return df.head(top_n)[['Consultant Name', 'Supervisor Name', 'overall_performance', 
-                              'vehicle_type', 'performance_color', 'race_position', 
-                              'track_position', 'TotalSalesVal', 'SalesValTarget',
-                              'lap_progress', 'completed_laps', 'current_lap_progress']].copy()
+    def get_racing_leaderboard(self, top_n=10, rank_method='ordinal'):
+        """Get top performers for racing view (rank_method: ordinal, min or dense)"""
+        return self.current_snapshot().get_racing_leaderboard(top_n, rank_method)
+    
+    def get_racing_leaderboard_by_race(self, race_name='Monaco', top_n=10, rank_method='ordinal'):
+        """Get top performers filtered by race (rank_method: ordinal, min or dense)"""
+        return self.current_snapshot().get_racing_leaderboard_by_race(race_name, top_n, rank_method)
     
     def get_race_teams_split(self):
-        """Get teams split between Monaco and Kyalami races"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data
-        teams = df['Supervisor Name'].unique()
-        
-        # Use actual supervisor assignments
-        monaco_teams = [
-            'Ashley Moyo', 'Mixo Makhubele', 'Nonhle Zondi', 'Rodney Naidu',
-            'Samantha Govender', 'Samuel Masubelele', 'Taedi Moletsane', 
-            'Thabo Mosweu', 'Thobile Phakhathi'
-        ]
-        
-        kyalami_teams = [
-            'Busisiwe Mabuza', 'Cindy Visser', 'Matimba Ngobeni', 'Mfundo Mdlalose',
-            'Mondli Nhlapho', 'Mosima Moshidi', 'Salome Baloyi', 'Shadleigh White', 'Tshepo Moeketsi'
-        ]
-        
-        return {
-            'Monaco': sorted(monaco_teams),
-            'Kyalami': sorted(kyalami_teams)
-        }
+        """Get teams split between races"""
+        return self.current_snapshot().get_race_teams_split()
     
     def get_team_summary_by_race(self, race_name='Monaco'):
         """Get team-level summary filtered by race"""
-        if self.processed_data is None:
-            self.process_for_racing_dashboard()
-        
-        df = self.processed_data.copy()
-        
-        # Filter by race based on actual supervisor assignments
-        monaco_supervisors = [
-            'Ashley Moyo', 'Mixo Makhubele', 'Nonhle Zondi', 'Rodney Naidu',
-            'Samantha Govender', 'Samuel Masubelele', 'Taedi Moletsane', 
-            'Thabo Mosweu', 'Thobile Phakhathi'
-        ]
-        
-        kyalami_supervisors = [
-            'Busisiwe Mabuza', 'Cindy Visser', 'Matimba Ngobeni', 'Mfundo Mdlalose',
-            'Mondli Nhlapho', 'Mosima Moshidi', 'Salome Baloyi', 'Shadleigh White', 'Tshepo Moeketsi'
-        ]
-        
-        if race_name == 'Monaco':
-            df = df[df['Supervisor Name'].isin(monaco_supervisors)]
-        elif race_name == 'Kyalami':
-            df = df[df['Supervisor Name'].isin(kyalami_supervisors)]
-        
-        # Group by supervisor (team)
-        team_summary = df.groupby('Supervisor Name').agg({
-            'SalesValTarget': 'sum',
-            'TotalSalesVal': 'sum',
-            'RealAppsTarget': 'sum',
-            'TotalRealAppsVol': 'sum',
-            'overall_performance': 'mean',
-            'Consultant Name': 'count'
-        }).reset_index()
-        
-        # Calculate team achievement rates
-        team_summary['team_sales_achievement'] = (
-            team_summary['TotalSalesVal'] / team_summary['SalesValTarget'] * 100
-        ).fillna(0)
-        
-        team_summary['team_apps_achievement'] = (
-            team_summary['TotalRealAppsVol'] / team_summary['RealAppsTarget'] * 100
-        ).fillna(0)
-        
-        # Rename columns for clarity
-        team_summary = team_summary.rename(columns={
-            'Supervisor Name': 'team_name',
-            'Consultant Name': 'team_size',
-            'overall_performance': 'avg_performance'
-        })
-        
-        # Sort by team achievement
-        team_summary = team_summary.sort_values('team_sales_achievement', ascending=False)
-        
-        return team_summary
\ No newline at end of file
+        return self.current_snapshot().get_team_summary_by_race(race_name)
@@ -4,6 +4,11 @@ from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 import math
+from utils.pace import PACE_COLUMNS, compute_pace
+from utils.ranking import top_k
+from utils.tiers import classify_performance, tier_attribute
+from utils.track_geometry import circuit_path, place_on_track
+from utils.track_assets import load_track_image, publish_track_image
 
 def create_total_gauge_view(company_metrics):
     """Create a total company progress gauge similar to the provided image"""
@@ -66,7 +71,7 @@ def create_team_racing_view(team_data, individual_data):
     """Create team racing view with supervisors/teams and their achievement rates"""
     
     # Use team data instead of individual data - sort by team achievement
-    top_performers = team_data.sort_values('team_sales_achievement', ascending=False).head(10)
+    top_performers = team_data.take(top_k(team_data['team_sales_achievement'], 10))
     
     fig = go.Figure()
     
@@ -74,64 +79,91 @@ def create_team_racing_view(team_data, individual_data):
     track_width = 100
     lane_height = 8
     
-    for i, (_, team) in enumerate(top_performers.iterrows()):
-        lane_y = i * lane_height
-        
-        # Draw track lane background
-        fig.add_shape(
-            type="rect",
-            x0=0, y0=lane_y-2, x1=track_width, y1=lane_y+2,
-            fillcolor="lightgray",
-            opacity=0.3,
-            layer="below",
-            line=dict(width=1, color="gray")
-        )
-        
-        # Calculate vehicle position based on team achievement
-        team_achievement = team['team_sales_achievement']
-        vehicle_position = min(team_achievement, track_width-5)  # Cap at track width
-        
-        # Get vehicle type and color based on team performance
-        vehicle_type = get_team_vehicle_type(team_achievement)
-        performance_color = get_team_performance_color(team_achievement)
-        
-        # Add vehicle at position
-        fig.add_trace(go.Scatter(
-            x=[vehicle_position],
-            y=[lane_y],
-            mode='markers+text',
-            marker=dict(size=25, color=performance_color),
-            text=vehicle_type,
-            textposition="middle center",
-            textfont=dict(size=18),
-            name=team['team_name'],
-            hovertemplate=f'<b>{team["team_name"]} Team</b><br>' +
-                         f'Team Achievement: {team["team_sales_achievement"]:.1f}%<br>' +
-                         f'Team Size: {team["team_size"]} members<br>' +
-                         f'Avg Performance: {team["avg_performance"]:.1f}%<br>' +
-                         f'Total Sales: R{team["TotalSalesVal"]:,.0f}<br>' +
-                         f'Team Target: R{team["SalesValTarget"]:,.0f}<br>' +
-                         '<extra></extra>',
-            showlegend=False
-        ))
-        
-        # Add supervisor name label
-        fig.add_annotation(
-            x=-5, y=lane_y,
-            text=f"{i+1}. {team['team_name']}",
-            showarrow=False,
-            font=dict(size=10),
-            xanchor="right"
-        )
-        
-        # Add team achievement percentage
-        fig.add_annotation(
-            x=vehicle_position+8, y=lane_y,
-            text=f"{team['team_sales_achievement']:.0f}%",
-            showarrow=False,
-            font=dict(size=10, color=performance_color, weight="bold"),
-            xanchor="left"
-        )
+    lane_count = len(top_performers)
+    lane_y = np.arange(lane_count) * lane_height
+    
+    # Calculate vehicle positions based on team achievement (capped at track width)
+    team_achievement = top_performers['team_sales_achievement'].to_numpy(dtype=float)
+    vehicle_position = np.minimum(team_achievement, track_width-5)
+    
+    # Get vehicle types and colors based on team performance
+    tiers = classify_performance(team_achievement, ['vehicle_type', 'performance_color'])
+    performance_colors = np.asarray(tiers['performance_color'])
+    
+    # Draw all track lane backgrounds as one bar trace
+    fig.add_trace(go.Bar(
+        x=np.full(lane_count, track_width),
+        y=lane_y,
+        width=4,
+        orientation='h',
+        marker=dict(color="lightgray", opacity=0.3, line=dict(width=1, color="gray")),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    
+    # Add checkered pattern at finish line
+    fig.add_trace(go.Bar(
+        x=np.full(lane_count, 2),
+        base=98,
+        y=lane_y,
+        width=4,
+        orientation='h',
+        marker=dict(
+            color=np.where(np.arange(lane_count) % 2 == 0, "black", "white"),
+            opacity=0.8,
+            line=dict(width=1, color="black")
+        ),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    
+    # Add every vehicle in one trace
+    fig.add_trace(go.Scatter(
+        x=vehicle_position,
+        y=lane_y,
+        mode='markers+text',
+        marker=dict(size=25, color=performance_colors),
+        text=np.asarray(tiers['vehicle_type']),
+        textposition="middle center",
+        textfont=dict(size=18),
+        customdata=np.column_stack((
+            top_performers['team_name'], team_achievement, top_performers['team_size'],
+            top_performers['avg_performance'], top_performers['TotalSalesVal'],
+            top_performers['SalesValTarget']
+        )),
+        hovertemplate='<b>%{customdata[0]} Team</b><br>' +
+                     'Team Achievement: %{customdata[1]:.1f}%<br>' +
+                     'Team Size: %{customdata[2]} members<br>' +
+                     'Avg Performance: %{customdata[3]:.1f}%<br>' +
+                     'Total Sales: R%{customdata[4]:,.0f}<br>' +
+                     'Team Target: R%{customdata[5]:,.0f}<br>' +
+                     '<extra></extra>',
+        showlegend=False
+    ))
+    
+    # Add supervisor name labels
+    fig.add_trace(go.Scatter(
+        x=np.full(lane_count, -5),
+        y=lane_y,
+        mode='text',
+        text=[f"{i+1}. {name}" for i, name in enumerate(top_performers['team_name'])],
+        textposition="middle left",
+        textfont=dict(size=10),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    
+    # Add team achievement percentages
+    fig.add_trace(go.Scatter(
+        x=vehicle_position+8,
+        y=lane_y,
+        mode='text',
+        text=[f"<b>{achievement:.0f}%</b>" for achievement in team_achievement],
+        textposition="middle right",
+        textfont=dict(size=10, color=performance_colors),
+        hoverinfo='skip',
+        showlegend=False
+    ))
     
     # Add finish line
     fig.add_shape(
@@ -140,17 +172,6 @@ def create_team_racing_view(team_data, individual_data):
         line=dict(color="red", width=3, dash="dash")
     )
     
-    # Add checkered pattern at finish line
-    for i in range(len(top_performers)):
-        y_pos = i * lane_height
-        fig.add_shape(
-            type="rect",
-            x0=98, y0=y_pos-2, x1=100, y1=y_pos+2,
-            fillcolor="black" if i % 2 == 0 else "white",
-            opacity=0.8,
-            line=dict(width=1, color="black")
-        )
-    
     fig.add_annotation(
         x=100, y=len(top_performers)*lane_height+5,
         text="🏁 FINISH LINE",
@@ -164,6 +185,7 @@ def create_team_racing_view(team_data, individual_data):
         yaxis=dict(range=[-5, len(top_performers)*lane_height+10], showticklabels=False, showgrid=False),
         height=max(400, len(top_performers)*50),
         plot_bgcolor='white',
+        barmode='overlay',
         showlegend=False
     )
     
@@ -171,58 +193,37 @@ def create_team_racing_view(team_data, individual_data):
 
 def get_team_vehicle_type(team_achievement):
     """Get vehicle type based on team achievement rate"""
-    if team_achievement >= 120:
-        return "🏎️"  # Formula 1 car - top performing teams
-    elif team_achievement >= 100:
-        return "🚗"   # Sports car - target achieved
-    elif team_achievement >= 80:
-        return "🚙"   # SUV - on track
-    elif team_achievement >= 60:
-        return "🚐"   # Van - needs boost
-    else:
-        return "🛻"   # Truck - recovery mode
+    return tier_attribute(team_achievement, 'vehicle_type')
 
 def get_team_performance_color(team_achievement):
     """Get color based on team achievement level"""
-    if team_achievement >= 120:
-        return "#FF6B35"  # Orange-red for superstars
-    elif team_achievement >= 100:
-        return "#4ECDC4"  # Teal for target achieved
-    elif team_achievement >= 80:
-        return "#45B7D1"  # Blue for on track
-    elif team_achievement >= 60:
-        return "#FFA07A"  # Light salmon for needs boost
-    else:
-        return "#FF6B6B"  # Red for recovery mode
+    return tier_attribute(team_achievement, 'performance_color')
 
-def create_course_map_view(team_data, track_image_path, race_name="Monaco"):
-    """Create course map view showing supervisor performance with actual track background"""
+def create_course_map_view(team_data, track_image_path, race_name="Monaco", static_images=False, max_teams=10):
+    """Create course map view showing supervisor performance with actual track background
+    
+    With static_images=True the track is served from the static folder by URL
+    instead of being embedded in the figure JSON. Pass max_teams=None to show every team.
+    """
     
     # Get top teams for course map
-    teams = team_data.head(10)
+    teams = team_data if max_teams is None else team_data.head(max_teams)
     
     # Create figure with track background
     fig = go.Figure()
     
-    # Add the track background image
-    from PIL import Image
-    import base64
-    import io
-    
-    # Load and encode the track image
+    # Load the track image (decoded and encoded once per file version)
     try:
-        img = Image.open(track_image_path)
-        img_width, img_height = img.size
-        
-        # Convert image to base64 for plotly
-        buffered = io.BytesIO()
-        img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode()
+        if static_images:
+            track_image = publish_track_image(track_image_path)
+        else:
+            track_image = load_track_image(track_image_path)
+        img_width, img_height = track_image.width, track_image.height
         
         # Add background image
         fig.add_layout_image(
             dict(
-                source=f"data:image/png;base64,{img_str}",
+                source=track_image.source,
                 xref="x",
                 yref="y",
                 x=0,
@@ -246,112 +247,69 @@ def create_course_map_view(team_data, track_image_path, race_name="Monaco"):
         img_width, img_height = 20, 16
     
     # Position supervisors on track based on their lap progress
-    for i, (_, team) in enumerate(teams.iterrows()):
-        # Calculate daily lap progress based on sales achievement
-        # Each "lap" represents daily target achievement (target/31 days)
-        daily_target = team['SalesValTarget'] / 31  # Daily target
-        daily_achievement = team['TotalSalesVal'] / 31  # Daily actual
-        laps_completed = daily_achievement / daily_target if daily_target > 0 else 0
-        
-        # Current lap progress (fractional part)
-        current_lap_progress = laps_completed - int(laps_completed)
-        
-        # Position calculation - place supervisors along track perimeter based on actual track layout
-        if race_name == "Monaco":
-            # Monaco track path positions (following the actual track layout)
-            track_positions = [
-                (img_width * 0.15, img_height * 0.75),  # Start/Finish straight
-                (img_width * 0.25, img_height * 0.85),  # Sainte Devote
-                (img_width * 0.40, img_height * 0.90),  # Beau Rivage
-                (img_width * 0.55, img_height * 0.85),  # Casino Square
-                (img_width * 0.68, img_height * 0.75),  # Mirabeau
-                (img_width * 0.75, img_height * 0.60),  # Loews Hairpin
-                (img_width * 0.80, img_height * 0.45),  # Portier
-                (img_width * 0.75, img_height * 0.30),  # Tunnel exit
-                (img_width * 0.65, img_height * 0.20),  # Nouvelle Chicane
-                (img_width * 0.50, img_height * 0.15),  # Tabac
-                (img_width * 0.35, img_height * 0.20),  # Swimming Pool
-                (img_width * 0.25, img_height * 0.35),  # La Rascasse
-                (img_width * 0.20, img_height * 0.50),  # Anthony Noghes
-                (img_width * 0.15, img_height * 0.65),  # Back to start
-            ]
-        else:  # Kyalami
-            # Kyalami track path positions (following the actual track layout)
-            track_positions = [
-                (img_width * 0.25, img_height * 0.70),  # Start/Finish
-                (img_width * 0.35, img_height * 0.80),  # Turn 1 approach
-                (img_width * 0.50, img_height * 0.85),  # Turn 1
-                (img_width * 0.65, img_height * 0.80),  # Turn 2
-                (img_width * 0.75, img_height * 0.65),  # Turn 3
-                (img_width * 0.80, img_height * 0.50),  # Turn 4
-                (img_width * 0.75, img_height * 0.35),  # Turn 5
-                (img_width * 0.65, img_height * 0.25),  # Turn 6 
-                (img_width * 0.50, img_height * 0.20),  # Turn 7
-                (img_width * 0.35, img_height * 0.25),  # Turn 8
-                (img_width * 0.25, img_height * 0.35),  # Turn 9
-                (img_width * 0.20, img_height * 0.50),  # Back straight
-            ]
-        
-        # Get position based on current lap progress
-        pos_index = int(current_lap_progress * len(track_positions))
-        pos_index = min(pos_index, len(track_positions) - 1)
-        x_pos, y_pos = track_positions[pos_index]
-        
-        # Add some random offset to avoid exact overlaps
-        x_pos += (i % 3 - 1) * img_width * 0.02
-        y_pos += ((i // 3) % 3 - 1) * img_height * 0.02
-        
-        # Get vehicle type and color based on team performance
-        vehicle_type = get_team_vehicle_type(team['team_sales_achievement'])
-        performance_color = get_team_performance_color(team['team_sales_achievement'])
-        
-        # Add supervisor vehicle with enhanced visibility
-        fig.add_trace(go.Scatter(
-            x=[x_pos],
-            y=[y_pos],
-            mode='markers+text',
-            marker=dict(
-                size=35, 
-                color=performance_color, 
-                line=dict(color='black', width=3),
-                symbol='circle'
-            ),
-            text=vehicle_type,
-            textposition="middle center",
-            textfont=dict(size=20, color='white', family="Arial Black"),
-            name=team['team_name'],
-            hovertemplate=f'<b>{team["team_name"]} Team</b><br>' +
-                         f'Laps Completed: {int(laps_completed):.0f}<br>' +
-                         f'Current Lap: {current_lap_progress*100:.1f}%<br>' +
-                         f'Team Achievement: {team["team_sales_achievement"]:.1f}%<br>' +
-                         f'Daily Target: R{daily_target:,.0f}<br>' +
-                         f'Daily Actual: R{daily_achievement:,.0f}<br>' +
-                         f'Team Size: {team["team_size"]} members<br>' +
-                         '<extra></extra>',
-            showlegend=False
-        ))
-        
-        # Add supervisor name label with better visibility
-        fig.add_annotation(
-            x=x_pos,
-            y=y_pos - img_height * 0.08,
-            text=f"<b>{team['team_name']}</b>",
-            showarrow=False,
-            font=dict(size=10, color="white", family="Arial"),
-            bgcolor="rgba(0,0,0,0.7)",
-            bordercolor="white",
-            borderwidth=1,
-            borderpad=2
-        )
+    # Each "lap" is one business day's worth of target; team summaries carry the
+    # pace computed once per snapshot, other frames get it for the current month
+    if not set(PACE_COLUMNS).issubset(teams.columns):
+        teams = teams.join(compute_pace(teams['SalesValTarget'], teams['TotalSalesVal']))
+    laps_completed = teams['laps_completed'].to_numpy(dtype=float)
+    current_lap_progress = teams['current_lap_progress'].to_numpy(dtype=float)
+    
+    # Place every team along the actual track layout, side by side where they'd overlap
+    x_pos, y_pos = place_on_track(race_name, current_lap_progress, img_width, img_height)
+    
+    # Get vehicle types and colors based on team performance
+    tiers = classify_performance(teams['team_sales_achievement'], ['vehicle_type', 'performance_color'])
+    
+    # Add every supervisor vehicle in a single trace
+    fig.add_trace(go.Scatter(
+        x=x_pos,
+        y=y_pos,
+        mode='markers+text',
+        marker=dict(
+            size=35, 
+            color=np.asarray(tiers['performance_color']), 
+            line=dict(color='black', width=3),
+            symbol='circle'
+        ),
+        text=np.asarray(tiers['vehicle_type']),
+        textposition="middle center",
+        textfont=dict(size=20, color='white', family="Arial Black"),
+        customdata=np.column_stack((
+            teams['team_name'], np.trunc(laps_completed), current_lap_progress * 100,
+            teams['team_sales_achievement'], teams['daily_target'], teams['daily_achievement'],
+            teams['team_size'], teams['pace'] * 100, teams['projected_achievement']
+        )),
+        hovertemplate='<b>%{customdata[0]} Team</b><br>' +
+                     'Laps Completed: %{customdata[1]:.0f}<br>' +
+                     'Current Lap: %{customdata[2]:.1f}%<br>' +
+                     'Team Achievement: %{customdata[3]:.1f}%<br>' +
+                     'Daily Target: R%{customdata[4]:,.0f}<br>' +
+                     'Daily Actual: R%{customdata[5]:,.0f}<br>' +
+                     'Pace: %{customdata[7]:.0f}% of expected to date<br>' +
+                     'Projected Finish: %{customdata[8]:.0f}% of target<br>' +
+                     'Team Size: %{customdata[6]} members<br>' +
+                     '<extra></extra>',
+        showlegend=False
+    ))
+    
+    # Add supervisor name labels as one text trace
+    fig.add_trace(go.Scatter(
+        x=x_pos,
+        y=y_pos - img_height * 0.08,
+        mode='text',
+        text=[f"<b>{name}</b>" for name in teams['team_name']],
+        textposition="middle center",
+        textfont=dict(size=10, color="black", family="Arial"),
+        hoverinfo='skip',
+        showlegend=False
+    ))
     
     # Add lap leaders info
     if not teams.empty:
-        lap_info = []
-        for i, (_, team) in enumerate(teams.head(5).iterrows()):
-            daily_target = team['SalesValTarget'] / 31
-            daily_achievement = team['TotalSalesVal'] / 31
-            laps_completed = daily_achievement / daily_target if daily_target > 0 else 0
-            lap_info.append(f"{i+1}. {team['team_name']}: {int(laps_completed):.0f} laps")
+        lap_info = [
+            f"{i+1}. {name}: {laps:.0f} laps"
+            for i, (name, laps) in enumerate(zip(teams['team_name'][:5], np.trunc(laps_completed[:5])))
+        ]
         
         fig.add_annotation(
             x=img_width * 0.02,
@@ -368,8 +326,7 @@ def create_course_map_view(team_data, track_image_path, race_name="Monaco"):
         )
     
     # Add start/finish line indicator
-    start_x = img_width * 0.15 if race_name == "Monaco" else img_width * 0.25
-    start_y = img_height * 0.75 if race_name == "Monaco" else img_height * 0.70
+    start_x, start_y = circuit_path(race_name, img_width, img_height).points[0]
     
     fig.add_annotation(
         x=start_x,
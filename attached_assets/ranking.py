@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Rank methods: ordinal = 1, 2, 3, 4; min = 1, 2, 2, 4; dense = 1, 2, 2, 3
+RANK_METHODS = {'ordinal': 'first', 'min': 'min', 'dense': 'dense'}
+
+
+def top_k(values, k):
+    """Positions of the k highest values, best first, in O(n) via np.argpartition.
+
+    Ties are broken by position (earlier rows first) and NaN ranks last, so the
+    result matches a stable descending sort followed by head(k).
+    """
+    scores = -np.asarray(values, dtype=float)
+    scores[np.isnan(scores)] = np.inf
+    n = len(scores)
+    k = max(0, min(int(k), n))
+
+    if k < n:
+        kth = scores[np.argpartition(scores, k - 1)[k - 1]] if k else -np.inf
+        # Everything strictly better than the k-th value, then the earliest ties
+        better = np.flatnonzero(scores < kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(better)]
+        candidates = np.concatenate([better, tied])
+    else:
+        candidates = np.arange(n)
+
+    return candidates[np.lexsort((candidates, scores[candidates]))]
+
+
+def key_ranks(keys):
+    """Position (0 = first) of each row of a frame of key columns in ascending key order, ties by row order"""
+    codes = [pd.factorize(keys[col], sort=True, use_na_sentinel=False)[0] for col in reversed(keys.columns)]
+    ranks = np.empty(len(keys), dtype=np.intp)
+    ranks[np.lexsort(codes)] = np.arange(len(keys))
+    return ranks
+
+
+def performance_order(scores, ranks):
+    """Positions in rank order: highest score first, equal scores by key rank (see key_ranks)"""
+    return np.lexsort((ranks, -np.asarray(scores, dtype=float)))
+
+
+def insert_positions(scores, ranks, new_scores, new_ranks):
+    """Where each new row goes among rows already in performance order, by binary search.
+
+    scores/ranks are the ordered rows' scores and key ranks, new_scores/new_ranks
+    the new rows' (in performance order themselves, so positions come out
+    non-decreasing). Key ranks must be distinct, as key_ranks gives them.
+    """
+    scores = -np.asarray(scores, dtype=float)
+    new_scores = -np.asarray(new_scores, dtype=float)
+    first = np.searchsorted(scores, new_scores, side='left')
+    tied = np.flatnonzero(first < np.searchsorted(scores, new_scores, side='right'))
+    if len(tied) == 0:
+        return first
+
+    # Equal scores are ordered by key rank: (start of the run of equal scores, key rank)
+    # ascends over the ordered rows, so one search places every row that ties
+    run_starts = np.flatnonzero(np.r_[True, scores[1:] != scores[:-1]])
+    run_start = np.repeat(run_starts, np.diff(np.r_[run_starts, len(scores)]))
+    scale = int(max(np.max(ranks, initial=0), np.max(new_ranks, initial=0))) + 1
+    composite = run_start.astype(np.int64) * scale + ranks
+    first[tied] = np.searchsorted(composite, first[tied].astype(np.int64) * scale + new_ranks[tied])
+    return first
+
+
+def rank_positions(values, method='ordinal'):
+    """Vectorized descending rank (1 = best) of each value"""
+    if method not in RANK_METHODS:
+        raise ValueError(f"Unknown rank method '{method}'. Use one of: {list(RANK_METHODS)}")
+    ranks = pd.Series(values).rank(method=RANK_METHODS[method], ascending=False, na_option='bottom')
+    return ranks.astype(int).to_numpy()
+
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+from utils.instrumentation import NULL_INSTRUMENTATION, Instrumentation, SpanRecord
+
+# Reruns kept in a session's rolling log
+MAX_PROFILED_RERUNS = 20
+
+# Timings of one rerun: finished spans in completion order and figure JSON sizes by chart name
+RerunProfile = namedtuple('RerunProfile', ['started', 'seconds', 'spans', 'payload_bytes'])
+
+# The profiler of the rerun running on each script thread
+_active = threading.local()
+
+
+def forward_to_active_profiler(record):
+    """Instrumentation sink passing spans to the profiler of the rerun running on this thread, if any.
+
+    Streamlit runs each session's script on its own thread, so a processor
+    shared by every session reports its stages only to the session that
+    triggered them.
+    """
+    profiler = getattr(_active, 'profiler', None)
+    if profiler is not None:
+        profiler.spans.append(record)
+
+
+class RerunProfiler:
+    """Opt-in timing of the blocks of one app rerun.
+
+    Blocks are timed with the same spans as the processor's stages; disabled,
+    a block costs one no-op context manager and nothing is recorded. Chart
+    payload sizes need the figure serialized once more, so they are only
+    measured while profiling.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.spans = []
+        self.payload_bytes = {}
+        self.instrumentation = Instrumentation([self.spans.append]) if enabled else NULL_INSTRUMENTATION
+        _active.profiler = self if enabled else None
+
+    def block(self, name, rows=None):
+        """Context manager timing one block of the rerun"""
+        return self.instrumentation.span(name, rows)
+
+    def record_payload(self, name, figure):
+        """Record the size of a figure's JSON payload"""
+        if self.enabled:
+            self.payload_bytes[name] = len(figure.to_json().encode('utf-8'))
+
+    def finish(self):
+        """Stop collecting and return the rerun's RerunProfile"""
+        if getattr(_active, 'profiler', None) is self:
+            _active.profiler = None
+        return RerunProfile(self.started, time.perf_counter() - self._start, list(self.spans), dict(self.payload_bytes))
+
+
+def spans_frame(profile):
+    """One row per timed block of a rerun, slowest first"""
+    df = pd.DataFrame(profile.spans, columns=SpanRecord._fields)
+    df['rows'] = df['rows'].astype('Int64')
+    df['ms'] = df['seconds'] * 1000
+    df['share_pct'] = df['seconds'] / profile.seconds * 100 if profile.seconds else 0.0
+    return df.sort_values('ms', ascending=False)[['stage', 'ms', 'share_pct', 'rows', 'error']]
+
+
+def payloads_frame(profile):
+    """Figure JSON sizes of a rerun, largest first"""
+    df = pd.DataFrame(list(profile.payload_bytes.items()), columns=['chart', 'bytes'])
+    df['kb'] = df['bytes'] / 1024
+    return df.sort_values('bytes', ascending=False)[['chart', 'kb']]
+
+
+def rerun_log_frame(profiles):
+    """One row per profiled rerun, newest first: total time, slowest block and chart payload"""
+    rows = []
+    for profile in reversed(profiles):
+        slowest = max(profile.spans, key=lambda span: span.seconds, default=None)
+        rows.append({
+            'started': profile.started.strftime('%H:%M:%S'),
+            'total_ms': profile.seconds * 1000,
+            'slowest_block': slowest.stage if slowest else None,
+            'slowest_ms': slowest.seconds * 1000 if slowest else None,
+            'payload_kb': sum(profile.payload_bytes.values()) / 1024,
+        })
+    return pd.DataFrame(rows, columns=['started', 'total_ms', 'slowest_block', 'slowest_ms', 'payload_kb'])
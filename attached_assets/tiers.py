@@ -0,0 +1,40 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+# Lower bounds (achievement %) of each tier above "Recovery Mode"
+TIER_THRESHOLDS = np.array([60, 80, 100, 120], dtype=float)
+
+# One entry per tier, lowest first; index matches the searchsorted tier code
+PERFORMANCE_TIERS = {
+    'performance_category': ["Recovery Mode", "Needs Boost", "On Track", "Target Achieved", "Superstar"],
+    'vehicle_type': ["🛻", "🚐", "🚙", "🚗", "🏎️"],  # Truck, Van, SUV, Sports car, Formula 1 car
+    'performance_color': ["#FF6B6B", "#FFA07A", "#45B7D1", "#4ECDC4", "#FF6B35"],
+    'performance_status': ["🚨 Recovery Mode", "⚡ Needs Boost", "📈 On Track", "✅ Target Achieved!", "🔥 On Fire!"],
+}
+
+
+def tier_codes(values):
+    """Vectorized tier code (0 = Recovery Mode ... 4 = Superstar) for achievement values"""
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(TIER_THRESHOLDS, values, side='right')
+    # NaN sorts past every threshold; treat it as no achievement like the old if/elif chain did
+    codes[np.isnan(values)] = 0
+    return codes
+
+
+def classify_performance(values, fields=None):
+    """Map achievement values to tier attributes in one pass, as categorical columns"""
+    codes = tier_codes(values)
+    fields = list(PERFORMANCE_TIERS) if fields is None else fields
+    return {
+        field: pd.Categorical.from_codes(codes, categories=PERFORMANCE_TIERS[field])
+        for field in fields
+    }
+
+
+def tier_attribute(value, field):
+    """Tier attribute for a single achievement value"""
+    code = 0 if pd.isna(value) else bisect.bisect_right(TIER_THRESHOLDS, value)
+    return PERFORMANCE_TIERS[field][code]
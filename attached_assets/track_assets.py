@@ -0,0 +1,73 @@
+import base64
+import io
+import os
+import shutil
+from collections import namedtuple
+from functools import lru_cache
+
+# Track backgrounds never need to be sharper than the rendered map
+DEFAULT_MAX_WIDTH = 1000
+DEFAULT_FORMAT = 'WEBP'
+DEFAULT_QUALITY = 80
+
+# `width`/`height` are the source image size, used as the figure's coordinate system
+TrackImage = namedtuple('TrackImage', ['source', 'width', 'height', 'encoded_bytes'])
+
+
+def _encode_image(img, image_format, quality):
+    """Encode an image, falling back to optimized PNG when the format isn't supported"""
+    buffered = io.BytesIO()
+    try:
+        img.save(buffered, format=image_format, quality=quality)
+    except (KeyError, OSError, ValueError):
+        image_format = 'PNG'
+        buffered = io.BytesIO()
+        img.save(buffered, format=image_format, optimize=True)
+    return buffered.getvalue(), image_format.lower()
+
+
+@lru_cache(maxsize=16)
+def _load_encoded(path, mtime_ns, max_width, image_format, quality):
+    """Decode, downsample and re-encode a track image; cached by path + mtime"""
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img_width, img_height = img.size
+        img.load()
+        if max_width and img_width > max_width:
+            img = img.resize((max_width, round(img_height * max_width / img_width)), Image.LANCZOS)
+        data, image_format = _encode_image(img, image_format, quality)
+
+    return data, image_format, img_width, img_height
+
+
+def load_track_image(path, max_width=DEFAULT_MAX_WIDTH, image_format=DEFAULT_FORMAT, quality=DEFAULT_QUALITY):
+    """Track background as an inline data URI, encoded once per file version"""
+    mtime_ns = os.stat(path).st_mtime_ns
+    data, encoded_format, width, height = _load_encoded(path, mtime_ns, max_width, image_format, quality)
+    source = f"data:image/{encoded_format};base64,{base64.b64encode(data).decode()}"
+    return TrackImage(source, width, height, len(data))
+
+
+def publish_track_image(path, static_dir='static', url_prefix='app/static', max_width=DEFAULT_MAX_WIDTH,
+                        image_format=DEFAULT_FORMAT, quality=DEFAULT_QUALITY):
+    """Write the encoded track image to a static folder and return it as a URL instead of inline data.
+
+    With Streamlit, serve `static_dir` by setting `server.enableStaticServing = true`;
+    the figure payload then carries only the URL.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    data, encoded_format, width, height = _load_encoded(path, mtime_ns, max_width, image_format, quality)
+
+    # Version the file name so browsers pick up a changed track image
+    stem = os.path.splitext(os.path.basename(path))[0]
+    file_name = f"{stem}_{mtime_ns}_{max_width}.{encoded_format}"
+    target = os.path.join(static_dir, file_name)
+    if not os.path.exists(target):
+        os.makedirs(static_dir, exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        shutil.move(tmp_path, target)
+
+    return TrackImage(f"{url_prefix}/{file_name}", width, height, len(data))
@@ -0,0 +1,109 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Circuit centre lines as fractions of the track image (x, y), starting at the start/finish line
+CIRCUIT_WAYPOINTS = {
+    'Monaco': [
+        (0.15, 0.75),  # Start/Finish straight
+        (0.25, 0.85),  # Sainte Devote
+        (0.40, 0.90),  # Beau Rivage
+        (0.55, 0.85),  # Casino Square
+        (0.68, 0.75),  # Mirabeau
+        (0.75, 0.60),  # Loews Hairpin
+        (0.80, 0.45),  # Portier
+        (0.75, 0.30),  # Tunnel exit
+        (0.65, 0.20),  # Nouvelle Chicane
+        (0.50, 0.15),  # Tabac
+        (0.35, 0.20),  # Swimming Pool
+        (0.25, 0.35),  # La Rascasse
+        (0.20, 0.50),  # Anthony Noghes
+        (0.15, 0.65),  # Back to start
+    ],
+    'Kyalami': [
+        (0.25, 0.70),  # Start/Finish
+        (0.35, 0.80),  # Turn 1 approach
+        (0.50, 0.85),  # Turn 1
+        (0.65, 0.80),  # Turn 2
+        (0.75, 0.65),  # Turn 3
+        (0.80, 0.50),  # Turn 4
+        (0.75, 0.35),  # Turn 5
+        (0.65, 0.25),  # Turn 6
+        (0.50, 0.20),  # Turn 7
+        (0.35, 0.25),  # Turn 8
+        (0.25, 0.35),  # Turn 9
+        (0.20, 0.50),  # Back straight
+    ],
+}
+DEFAULT_CIRCUIT = 'Kyalami'
+
+# Gap between side-by-side vehicles, as a fraction of the image diagonal
+DEFAULT_LANE_SPACING = 0.03
+
+
+class TrackPath:
+    """Closed circuit polyline with precomputed cumulative arc length"""
+
+    def __init__(self, waypoints):
+        points = np.asarray(waypoints, dtype=float)
+        # Close the loop back to the start/finish line
+        self.points = np.vstack([points, points[:1]])
+        segment_lengths = np.hypot(*np.diff(self.points, axis=0).T)
+        self.cumulative = np.concatenate([[0.0], np.cumsum(segment_lengths)])
+        self.length = self.cumulative[-1]
+
+    def distance(self, lap_progress):
+        """Arc-length distance from the start line for lap progress values (wrapped to one lap)"""
+        return np.mod(np.asarray(lap_progress, dtype=float), 1.0) * self.length
+
+    def positions(self, lap_progress):
+        """Exact (x, y) on the centre line for each lap progress value"""
+        distance = self.distance(lap_progress)
+        x = np.interp(distance, self.cumulative, self.points[:, 0])
+        y = np.interp(distance, self.cumulative, self.points[:, 1])
+        return x, y
+
+    def normals(self, lap_progress):
+        """Unit normal of the track segment under each lap progress value"""
+        distance = self.distance(lap_progress)
+        segment = np.clip(np.searchsorted(self.cumulative, distance, side='right') - 1, 0, len(self.points) - 2)
+        tangent = self.points[segment + 1] - self.points[segment]
+        tangent /= np.maximum(np.hypot(tangent[:, 0], tangent[:, 1]), 1e-12)[:, None]
+        return -tangent[:, 1], tangent[:, 0]
+
+    def place(self, lap_progress, lane_spacing):
+        """Positions with colliding vehicles spread across lanes (0, +1, -1, +2, ...) in bulk.
+
+        Vehicles closer than `lane_spacing` along the track share a slot and are
+        offset along the track normal by their order within the slot.
+        """
+        lap_progress = np.asarray(lap_progress, dtype=float)
+        x, y = self.positions(lap_progress)
+        if len(lap_progress) == 0 or lane_spacing <= 0:
+            return x, y
+
+        slot = np.floor(self.distance(lap_progress) / lane_spacing)
+        order = np.lexsort((np.arange(len(slot)), slot))
+        sorted_slot = slot[order]
+
+        # Rank within each slot: position minus the index where that slot starts
+        index = np.arange(len(slot))
+        slot_start = np.maximum.accumulate(np.where(np.r_[True, sorted_slot[1:] != sorted_slot[:-1]], index, 0))
+        rank = np.empty(len(slot), dtype=int)
+        rank[order] = index - slot_start
+
+        lane = np.where(rank % 2 == 1, (rank + 1) // 2, -(rank // 2))
+        normal_x, normal_y = self.normals(lap_progress)
+        return x + normal_x * lane * lane_spacing, y + normal_y * lane * lane_spacing
+
+
+@lru_cache(maxsize=32)
+def circuit_path(race_name, width=1.0, height=1.0):
+    """TrackPath for a circuit scaled to an image size (arc length is measured in image units)"""
+    waypoints = CIRCUIT_WAYPOINTS.get(race_name, CIRCUIT_WAYPOINTS[DEFAULT_CIRCUIT])
+    return TrackPath(np.asarray(waypoints) * [width, height])
+
+
+def place_on_track(race_name, lap_progress, width=1.0, height=1.0, lane_spacing=DEFAULT_LANE_SPACING):
+    """Vectorized (x, y) for every team's lap progress, with collision-avoiding lane offsets"""
+    return circuit_path(race_name, width, height).place(lap_progress, lane_spacing * np.hypot(width, height))
@@ -1,5 +1,10 @@
 import pandas as pd
 import numpy as np
+from utils.ranking import rank_positions
+from utils.tiers import tier_attribute
+
+# Race names used for generated data; extra races are numbered
+SAMPLE_RACE_NAMES = ['Monaco', 'Kyalami']
 
 def load_sample_data():
     """Load sample sales data for demonstration"""
@@ -47,6 +52,60 @@ def load_sample_data():
     
     return df
 
+def generate_sales_performance_data(n_consultants=200, n_supervisors=18, n_races=2, seed=42, idle_share=0.0):
+    """Synthetic 'Sales Perfromance' sheet rows at any scale, plus the matching race config.
+
+    Returns (df, races) where df has the workbook's columns (achievement columns
+    as fractions, like the real sheet) and races maps each race name to its
+    supervisors, ready for RaceRegistry(races). idle_share of the consultants
+    have no sales or applications yet, so they all tie on a score of 0.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_consultants
+    
+    supervisors = np.array([f"Supervisor {i + 1:04d}" for i in range(n_supervisors)])
+    race_names = SAMPLE_RACE_NAMES[:n_races] + [f"Race {k + 1}" for k in range(len(SAMPLE_RACE_NAMES), n_races)]
+    races = {name: supervisors[k::n_races].tolist() for k, name in enumerate(race_names)}
+    
+    # Achievement spread like the sample data: around 85%, clamped to 30%..140%
+    sales_rate = np.clip(rng.normal(0.85, 0.25, n), 0.3, 1.4)
+    apps_rate = np.clip(rng.normal(0.85, 0.3, n), 0, 1.6)
+    
+    sales_target = np.round(rng.uniform(200_000, 1_600_000, n), -2)
+    apps_target = rng.integers(20, 161, n)
+    apps_volume = np.round(apps_target * apps_rate)
+    card_deals = rng.integers(0, 9, n)
+    card_target = np.full(n, 10)
+    
+    df = pd.DataFrame({
+        'Consultant Name': [f"Consultant {i + 1:07d}" for i in range(n)],
+        'Supervisor Name': supervisors[rng.integers(0, n_supervisors, n)],
+        'RealAppsTarget': apps_target.astype(float),
+        'TotalRealAppsVol': apps_volume,
+        'Real Apps % to Target': apps_volume / apps_target,
+        'SalesValTarget': sales_target,
+        'TotalSalesVal': np.round(sales_target * sales_rate, 2),
+        'Sales Val % to Target': sales_rate,
+        'LoanDealsVol': rng.integers(0, 11, n).astype(float),
+        'LoanSaleVal': np.round(rng.uniform(0, 1_000_000, n), -2),
+        'CardDealsVol': card_deals.astype(float),
+        'CardSaleVal': np.round(rng.uniform(0, 1_100_000, n), 2),
+        'CreditCardDealTarget': card_target.astype(float),
+        'Creditcard  % to target': card_deals / card_target,
+    })
+    
+    if idle_share:
+        idle = rng.choice(n, int(n * idle_share), replace=False)
+        df.loc[idle, ['TotalRealAppsVol', 'Real Apps % to Target', 'TotalSalesVal', 'Sales Val % to Target']] = 0
+    
+    return df, races
+
+def write_sample_workbook(path, n_consultants=200, n_supervisors=18, n_races=2, seed=42, idle_share=0.0):
+    """Write a synthetic workbook with a 'Sales Perfromance' sheet; returns the race config"""
+    df, races = generate_sales_performance_data(n_consultants, n_supervisors, n_races, seed, idle_share)
+    df.to_excel(path, sheet_name='Sales Perfromance', index=False)  # Note: typo in sheet name
+    return races
+
 def calculate_team_performance(df):
     """Calculate team-based performance metrics"""
     if 'team' not in df.columns:
@@ -76,36 +135,14 @@ def format_currency(amount):
 
 def get_performance_emoji(achievement_rate):
     """Get emoji based on performance level"""
-    if achievement_rate >= 120:
-        return "🏎️"
-    elif achievement_rate >= 100:
-        return "🚗"
-    elif achievement_rate >= 80:
-        return "🚙"
-    elif achievement_rate >= 60:
-        return "🚐"
-    else:
-        return "🛻"
+    return tier_attribute(achievement_rate, 'vehicle_type')
 
 def get_performance_status(achievement_rate):
     """Get status text based on performance level"""
-    if achievement_rate >= 120:
-        return "🔥 On Fire!"
-    elif achievement_rate >= 100:
-        return "✅ Target Achieved!"
-    elif achievement_rate >= 80:
-        return "📈 On Track"
-    elif achievement_rate >= 60:
-        return "⚡ Needs Boost"
-    else:
-        return "🚨 Recovery Mode"
+    return tier_attribute(achievement_rate, 'performance_status')
 
 def calculate_racing_position(df):
     """Calculate racing positions for each salesperson"""
-    df_sorted = df.sort_values('achievement_rate', ascending=False)
-    positions = {}
-    
-    for i, (_, row) in enumerate(df_sorted.iterrows()):
-        positions[row['salesperson']] = i + 1
+    positions = rank_positions(df['achievement_rate'])
     
-    return positions
+    return dict(zip(df['salesperson'], positions.tolist()))
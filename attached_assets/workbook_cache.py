@@ -0,0 +1,141 @@
+import hashlib
+import os
+import tempfile
+from collections import namedtuple
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = ".racing_cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+WorkbookFingerprint = namedtuple(
+    'WorkbookFingerprint', ['path', 'size', 'mtime_ns', 'content_hash']
+)
+
+# (path, size, mtime) -> content hash, so a workbook is only hashed once per process
+_content_hash_memo = {}
+
+
+def hash_file(path):
+    """Hash a file's contents in fixed-size chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def workbook_fingerprint(path):
+    """Fingerprint a workbook by path, size, mtime and content hash"""
+    abs_path = os.path.abspath(path)
+    stat = os.stat(abs_path)
+    memo_key = (abs_path, stat.st_size, stat.st_mtime_ns)
+
+    content_hash = _content_hash_memo.get(memo_key)
+    if content_hash is None:
+        content_hash = hash_file(abs_path)
+        _content_hash_memo[memo_key] = content_hash
+
+    return WorkbookFingerprint(abs_path, stat.st_size, stat.st_mtime_ns, content_hash)
+
+
+def fingerprint_key(fingerprint, *extra):
+    """Stable string key for a fingerprint plus any extra qualifiers (sheet, columns)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in tuple(fingerprint) + extra:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def make_arrow_safe(df):
+    """Stringify mixed-type object columns (e.g. a 'Total' footer under ReportMonth) so Arrow can store them"""
+    for col in df.columns:
+        if df[col].dtype == object:
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            if inferred.startswith('mixed'):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+class WorkbookCache:
+    """Persistent columnar (Arrow IPC) cache of parsed workbook sheets"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, fingerprint, sheet_name, columns=None):
+        """Location of the cached sheet for this workbook fingerprint.
+
+        Names start with a key of the workbook path, sheet and columns alone,
+        shared by every version of the workbook, so stale versions can be found.
+        """
+        columns = tuple(columns) if columns else None
+        slot = fingerprint_key((fingerprint.path,), sheet_name, columns)
+        key = fingerprint_key(fingerprint, sheet_name, columns)
+        return os.path.join(self.cache_dir, f"{slot}-{key}.arrow")
+
+    def load(self, excel_file_path, sheet_name, loader, columns=None):
+        """Return the cached sheet, or parse it with `loader()` and cache the result"""
+        try:
+            from pyarrow import feather
+        except ImportError:
+            # No pyarrow available - fall back to parsing the workbook every time
+            return make_arrow_safe(loader())
+
+        fingerprint = workbook_fingerprint(excel_file_path)
+        path = self.entry_path(fingerprint, sheet_name, columns)
+
+        if os.path.exists(path):
+            try:
+                table = feather.read_table(path, memory_map=True)
+                self.hits += 1
+                return table.to_pandas()
+            except Exception:
+                # Corrupt or incompatible entry - rebuild it below
+                pass
+
+        self.misses += 1
+        df = make_arrow_safe(loader())
+        self.store(path, df)
+        return df
+
+    def store(self, path, df):
+        """Write a sheet to the cache atomically and drop older versions of it; caching failures are never fatal"""
+        from pyarrow import feather
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # A name of its own for every writer: threads of one process may store the same entry at once
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', prefix=os.path.basename(path) + '.', dir=self.cache_dir)
+            os.close(fd)
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+        except Exception:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.remove_stale(path)
+
+    def remove_stale(self, path):
+        """Remove the entries of earlier versions of the workbook sheet cached at `path`"""
+        name = os.path.basename(path)
+        slot = name.split('-', 1)[0] + '-'
+        for other in os.listdir(self.cache_dir):
+            if other.startswith(slot) and other.endswith('.arrow') and other != name:
+                try:
+                    os.remove(os.path.join(self.cache_dir, other))
+                except OSError:
+                    # Already removed by another writer, or still mapped by a reader (Windows)
+                    pass
+
+    def clear(self):
+        """Remove every cached sheet"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.arrow'):
+                os.remove(os.path.join(self.cache_dir, name))
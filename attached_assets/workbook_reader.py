@@ -0,0 +1,87 @@
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def calamine_available():
+    """Whether the Rust-backed calamine engine can be used by pandas"""
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _to_frame(rows, names, numeric_columns):
+    """Build a chunk DataFrame, coercing numeric columns as we go"""
+    chunk = pd.DataFrame.from_records(rows, columns=names)
+    for col in numeric_columns:
+        if col in chunk.columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    return chunk
+
+
+def iter_sheet_chunks(excel_file_path, sheet_name, columns=None, numeric_columns=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a sheet as DataFrame chunks using openpyxl read-only mode.
+
+    Only `columns` (by header name) are kept; columns missing from the sheet are
+    skipped, and blank rows are dropped. Memory stays bounded by `chunk_size` rows.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name]
+        # Don't trust the stored sheet dimensions; read until the rows run out
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        header = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+        wanted = header if columns is None else [col for col in columns if col in header]
+        positions = [header.index(col) for col in wanted]
+
+        buffer = []
+        for row in rows:
+            # Read-only rows can be shorter than the header when trailing cells are empty
+            values = tuple(row[i] if i < len(row) else None for i in positions)
+            if all(value is None for value in values):
+                continue
+            buffer.append(values)
+            if len(buffer) >= chunk_size:
+                yield _to_frame(buffer, wanted, numeric_columns)
+                buffer = []
+
+        if buffer:
+            yield _to_frame(buffer, wanted, numeric_columns)
+    finally:
+        workbook.close()
+
+
+def read_sheet(excel_file_path, sheet_name, columns=None, numeric_columns=(), on_chunk=None,
+               chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read a projected sheet, with calamine when installed, else by streaming openpyxl chunks.
+
+    `on_chunk(chunk)` is called for each streamed chunk so callers can show progress
+    before the whole sheet has been read.
+    """
+    if calamine_available() and on_chunk is None:
+        usecols = None if columns is None else (lambda name: name in columns)
+        df = pd.read_excel(excel_file_path, sheet_name=sheet_name, engine='calamine', usecols=usecols)
+        df = df.dropna(how='all')
+        for col in numeric_columns:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df.reset_index(drop=True)
+
+    chunks = []
+    for chunk in iter_sheet_chunks(excel_file_path, sheet_name, columns, numeric_columns, chunk_size):
+        chunks.append(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk)
+
+    if not chunks:
+        return pd.DataFrame(columns=columns if columns is not None else [])
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+
+DEFAULT_POLL_INTERVAL = 0.25
+# A write is considered complete once size and mtime have been stable this long.
+# Excel and openpyxl saves finish well within it; a reload starts at most
+# poll_interval + settle_seconds after a write (settle_seconds with file events)
+DEFAULT_SETTLE_SECONDS = 0.4
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, or None when it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class WorkbookWatcher:
+    """Watch a workbook and call `reload()` on a worker thread once each write has settled.
+
+    File events come from watchdog (inotify/FSEvents/...) when it is installed;
+    otherwise the file's size and mtime are polled. Bursts of events (Excel
+    writes a temp file and renames it) are debounced into one reload, which only
+    runs after the file has stopped changing for `settle_seconds`.
+    """
+
+    def __init__(self, excel_file_path, reload, poll_interval=DEFAULT_POLL_INTERVAL,
+                 settle_seconds=DEFAULT_SETTLE_SECONDS):
+        self.path = os.path.abspath(excel_file_path)
+        self.reload = reload
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        # Return value of the last successful reload, and the error of the last failed one
+        self.latest = None
+        self.last_error = None
+        self.reloads = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    @property
+    def using_events(self):
+        return self._observer is not None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._observer = self._start_observer()
+        self._thread = threading.Thread(target=self._run, name='workbook-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def notify(self):
+        """Signal that the file may have changed (called from file event handlers)"""
+        self._wake.set()
+
+    def _start_observer(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        watcher = self
+
+        class WorkbookEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Saves often land as a rename of a temp file onto the workbook
+                paths = [getattr(event, 'src_path', None), getattr(event, 'dest_path', None)]
+                if any(path and os.path.abspath(path) == watcher.path for path in paths):
+                    watcher.notify()
+
+        try:
+            observer = Observer()
+            observer.schedule(WorkbookEventHandler(), os.path.dirname(self.path), recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception:
+            # e.g. inotify watch limit reached; polling still works
+            return None
+        return observer
+
+    def _run(self):
+        signature = file_signature(self.path)
+        changed_at = None
+
+        while not self._stop.is_set():
+            if changed_at is not None:
+                # A write is settling: look again as soon as it could have settled
+                timeout = max(0.0, changed_at + self.settle_seconds - time.monotonic())
+            else:
+                # With file events we can sleep until something happens
+                timeout = self.poll_interval if self._observer is None else None
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+
+            current = file_signature(self.path)
+            if current != signature:
+                # Still being written (or just replaced); restart the settle timer
+                signature = current
+                changed_at = time.monotonic()
+                continue
+
+            if changed_at is not None and signature is not None \
+                    and time.monotonic() - changed_at >= self.settle_seconds:
+                changed_at = None
+                try:
+                    self.latest = self.reload()
+                    self.last_error = None
+                    self.reloads += 1
+                except Exception as e:
+                    # Keep serving the previous data; the next change triggers another attempt
+                    self.last_error = e
@@ -0,0 +1,57 @@
+import os
+import re
+import sys
+import tempfile
+
+import pytest
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'attached_assets')
+
+# Uploaded copies carry a millisecond timestamp suffix (racing_data_processor_1755438570943.py)
+TIMESTAMP_SUFFIX = re.compile(r'_(\d{10,})$')
+
+
+def _build_utils_package():
+    """Link the latest copy of every module in attached_assets into an importable `utils` package"""
+    latest = {}
+    for name in os.listdir(ASSETS_DIR):
+        stem, ext = os.path.splitext(name)
+        if ext not in ('.py', '.json'):
+            continue
+        match = TIMESTAMP_SUFFIX.search(stem)
+        module = stem[:match.start()] if match else stem
+        stamp = int(match.group(1)) if match else 0
+        if module not in latest or stamp > latest[module][0]:
+            latest[module] = (stamp, name)
+
+    root = tempfile.mkdtemp(prefix='racing-tests-')
+    package = os.path.join(root, 'utils')
+    os.mkdir(package)
+    for module, (_, name) in latest.items():
+        if module == 'app' or name == 'requests.json':
+            continue
+        target = '__init__.py' if module == '__init__' else module + os.path.splitext(name)[1]
+        os.symlink(os.path.join(ASSETS_DIR, name), os.path.join(package, target))
+    os.symlink(os.path.join(ASSETS_DIR, latest['app'][1]), os.path.join(root, 'app.py'))
+    return root
+
+
+UTILS_ROOT = _build_utils_package()
+sys.path.insert(0, UTILS_ROOT)
+
+
+@pytest.fixture
+def app_script():
+    """Path of the latest Streamlit app script"""
+    return os.path.join(UTILS_ROOT, 'app.py')
+
+
+@pytest.fixture
+def sample_workbook(tmp_path):
+    """A generated Sales Performance workbook, and the race config matching its supervisors"""
+    from utils.race_registry import RaceRegistry
+    from utils.utils import write_sample_workbook
+
+    path = str(tmp_path / 'sales.xlsx')
+    races = write_sample_workbook(path, n_consultants=300, n_supervisors=12)
+    return path, RaceRegistry(races)
@@ -0,0 +1,253 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+import utils.api_server as api_server
+from utils.api_server import RacingApi
+from utils.benchmark import changed_rows
+from utils.change_feed import ChangeFeed
+from utils.racing_data_processor import RacingDataProcessor
+from utils.utils import generate_sales_performance_data
+
+SHEET_NAME = 'Sales Perfromance'
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Path of a generated workbook, and a function writing the next day's edits to it"""
+    path = str(tmp_path / 'sales.xlsx')
+    raw, _ = generate_sales_performance_data(n_consultants=300, n_supervisors=12)
+    raw.to_excel(path, sheet_name=SHEET_NAME, index=False)
+    sheets = [raw]
+
+    def edit():
+        sheets.append(changed_rows(sheets[-1], share=0.05, seed=len(sheets)))
+        sheets[-1].to_excel(path, sheet_name=SHEET_NAME, index=False)
+
+    return path, edit
+
+
+@pytest.fixture
+def api(workbook, tmp_path, monkeypatch):
+    # The processor's parsed-sheet cache goes under the working directory
+    monkeypatch.chdir(tmp_path)
+    api = RacingApi(workbook[0])
+    yield api
+    if api._watcher is not None:
+        api._watcher.stop()
+
+
+def request(api, path, query_string=b'', headers=(), method='GET'):
+    """Run one request through the ASGI app; returns (status, headers, body)"""
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string, 'headers': list(headers)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(api(scope, receive, send))
+    start, body = messages
+    return start['status'], dict(start['headers']), body['body']
+
+
+def test_routes_serve_the_snapshot_as_json(api):
+    status, headers, body = request(api, '/api/company')
+    assert status == 200 and headers[b'content-type'] == b'application/json'
+    assert json.loads(body) == json.loads(json.dumps(api.loaded.snapshot.get_total_company_metrics(), default=float))
+
+    status, _, body = request(api, '/api/leaderboard', b'top_n=5')
+    assert status == 200
+    leaders = json.loads(body)
+    assert len(leaders) == 5
+    assert [row['Consultant Name'] for row in leaders] == \
+        api.loaded.snapshot.get_racing_leaderboard(5)['Consultant Name'].tolist()
+
+    status, _, body = request(api, '/api/teams')
+    assert status == 200 and len(json.loads(body)) == len(api.loaded.snapshot.get_team_summary())
+
+    status, _, body = request(api, '/api/races')
+    assert status == 200 and set(json.loads(body)['races']) == set(api.loaded.snapshot.race_registry.races)
+
+
+@pytest.mark.parametrize('path, query_string, method, status', [
+    ('/api/nowhere', b'', 'GET', 404),
+    ('/api/teams', b'race=Nowhere', 'GET', 404),
+    ('/api/leaderboard', b'top_n=many', 'GET', 400),
+    ('/api/leaderboard', b'rank=alphabetical', 'GET', 400),
+    ('/api/company', b'', 'POST', 405),
+])
+def test_bad_requests_get_a_json_error(api, path, query_string, method, status):
+    response_status, headers, body = request(api, path, query_string, method=method)
+    assert response_status == status
+    assert headers[b'content-type'] == b'application/json'
+    assert 'error' in json.loads(body)
+
+
+def test_head_requests_get_headers_only(api):
+    status, headers, body = request(api, '/api/company', method='HEAD')
+    assert status == 200 and body == b''
+    assert int(headers[b'content-length']) > 0
+
+
+def test_etag_answers_304_until_the_workbook_changes(api, workbook):
+    _, headers, body = request(api, '/api/leaderboard', b'top_n=5')
+    etag = headers[b'etag']
+
+    status, headers, body = request(api, '/api/leaderboard', b'top_n=5', [(b'if-none-match', etag)])
+    assert (status, body) == (304, b'')
+    assert headers[b'etag'] == etag
+    # The tag covers the query too
+    status, _, _ = request(api, '/api/leaderboard', b'top_n=6', [(b'if-none-match', etag)])
+    assert status == 200
+
+    workbook[1]()
+    api.reload()
+    status, headers, body = request(api, '/api/leaderboard', b'top_n=5', [(b'if-none-match', etag)])
+    assert status == 200 and headers[b'etag'] != etag and body
+
+
+def test_reload_among_tied_rows_matches_a_full_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # A sixth of the sheet ties on a score of 0, and the edit books loans for some of them
+    path = str(tmp_path / 'sales.xlsx')
+    raw, _ = generate_sales_performance_data(n_consultants=600, n_supervisors=12, idle_share=0.16)
+    raw.to_excel(path, sheet_name=SHEET_NAME, index=False)
+    api = RacingApi(path)
+    try:
+        first = api.get_loaded().snapshot
+        changed_rows(raw, share=0.1).to_excel(path, sheet_name=SHEET_NAME, index=False)
+        api.reload()
+    finally:
+        api._watcher.stop()
+
+    snapshot = api.loaded.snapshot
+    assert snapshot.version == first.version + 1
+    full = RacingDataProcessor(path, cache=False).current_snapshot()
+    pd.testing.assert_frame_equal(snapshot.processed_data, full.processed_data)
+
+
+class StreamClient:
+    """An SSE client on /api/stream whose sends can be held up, like a slow connection"""
+
+    def __init__(self, api):
+        self.api = api
+        self.messages = []
+        self.receiving = asyncio.Event()
+        self.receiving.set()
+        self.disconnected = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.api.stream({'type': 'http', 'path': '/api/stream'}, self.receive, self.send))
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        await self.receiving.wait()
+        self.messages.append(message)
+
+    async def wait_for(self, count):
+        while len(self.messages) < count:
+            await asyncio.sleep(0.01)
+
+    def events(self):
+        """(name, payload) of every SSE event received, skipping comments"""
+        events = []
+        for message in self.messages[1:]:
+            body = message['body'].decode('utf-8')
+            if body.startswith(':'):
+                continue
+            fields = dict(line.split(': ', 1) for line in body.strip().split('\n'))
+            events.append((fields['event'], json.loads(fields['data'])))
+        return events
+
+    async def disconnect(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+def test_stream_sends_hello_then_position_deltas(api, workbook):
+    async def scenario():
+        client = StreamClient(api)
+        client.start()
+        await client.wait_for(2)
+        first = api.loaded.snapshot
+
+        workbook[1]()
+        await asyncio.to_thread(api.reload)
+        await client.wait_for(3)
+        await client.disconnect()
+        return client, first
+
+    client, first = asyncio.run(scenario())
+    assert client.messages[0]['status'] == 200
+    assert dict(client.messages[0]['headers'])[b'content-type'] == b'text/event-stream'
+    (hello_name, hello), (name, event) = client.events()
+    assert hello_name == 'hello' and hello == {'data_version': first.version}
+    assert name == 'positions'
+    assert event['data_version'] == api.loaded.snapshot.version
+    assert event['previous_version'] == first.version
+    assert event['changed'] and not event['added'] and not event['removed']
+    assert len(api.change_feed) == 0
+
+
+def test_stream_keeps_idle_connections_alive(api, monkeypatch):
+    monkeypatch.setattr(api_server, 'HEARTBEAT_SECONDS', 0.05)
+
+    async def scenario():
+        client = StreamClient(api)
+        client.start()
+        await client.wait_for(3)
+        await client.disconnect()
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.messages[2]['body'] == b': keep-alive\n\n'
+    assert client.task.done()
+
+
+def test_stream_resyncs_a_client_that_falls_behind(api, workbook):
+    api.change_feed = ChangeFeed(max_pending=1)
+
+    async def scenario():
+        client = StreamClient(api)
+        client.start()
+        await client.wait_for(2)
+        # The client stops reading while three reloads are published
+        client.receiving.clear()
+        for _ in range(3):
+            workbook[1]()
+            await asyncio.to_thread(api.reload)
+            await asyncio.sleep(0.05)
+        client.receiving.set()
+        await client.wait_for(4)
+        await client.disconnect()
+        return client
+
+    client = asyncio.run(scenario())
+    (_, hello), (_, delta), (name, resync) = client.events()
+    assert delta['previous_version'] == hello['data_version']
+    assert name == 'resync'
+    snapshot = api.loaded.snapshot
+    assert resync['data_version'] == snapshot.version == delta['data_version'] + 2
+    assert pd.DataFrame(resync['positions'])['race_position'].tolist() == snapshot.processed_data['race_position'].tolist()
+
+
+def test_stream_without_a_workbook_is_an_error(monkeypatch):
+    monkeypatch.delenv(api_server.WORKBOOK_ENV_VAR, raising=False)
+
+    async def scenario():
+        client = StreamClient(RacingApi())
+        client.start()
+        await asyncio.wait_for(client.task, 5)
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.messages[0]['status'] == 503
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+
+pytest.importorskip('streamlit')
+from streamlit.testing.v1 import AppTest
+
+from utils.utils import write_sample_workbook
+
+# The workbook the app loads when "Use existing Direct Sales Gamification file" is ticked
+EXISTING_WORKBOOK = "attached_assets/Direct Sales Gamification_Racing Targets_1755242584815_1755260744945.xlsx"
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Working directory holding the workbook the app opens by default"""
+    os.makedirs(tmp_path / 'attached_assets')
+    write_sample_workbook(str(tmp_path / EXISTING_WORKBOOK), n_consultants=120, n_supervisors=6)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run_app(app_script):
+    app = AppTest.from_file(app_script, default_timeout=60)
+    app.run()
+    assert not app.exception
+    assert not [error.value for error in app.error]
+    assert "120 consultants loaded" in [info.value for info in app.sidebar.info][0]
+    return app
+
+
+def test_cached_processor_loads_on_later_runs_and_sessions(app_dir, app_script):
+    # The first run reads the workbook; the rerun and the new session hit the processor cache
+    app = run_app(app_script)
+    app.run()
+    assert not app.exception
+    assert not [error.value for error in app.error]
+
+    run_app(app_script)
+
+
+def test_auto_refresh_renders_the_dashboard_in_the_live_fragment(app_dir, app_script):
+    app = run_app(app_script)
+    app.sidebar.checkbox[1].check().run()
+    assert not app.exception
+    assert app.sidebar.checkbox[1].label == "Auto-refresh when the workbook changes"
+    assert len(app.metric) == 4
+    assert app.session_state.watcher_version == (EXISTING_WORKBOOK, 0)
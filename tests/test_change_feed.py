@@ -0,0 +1,75 @@
+import asyncio
+
+import pandas as pd
+
+from utils.change_feed import RESYNC, ChangeFeed, diff_positions
+
+REGION_KEY_COLUMNS = ['Region', 'Consultant Name', 'Supervisor Name']
+
+
+def positions(rows, region=None):
+    """A processed frame with the tracked columns, one (consultant, supervisor, position, performance, sales) per row"""
+    df = pd.DataFrame(rows, columns=['Consultant Name', 'Supervisor Name', 'race_position',
+                                     'overall_performance', 'TotalSalesVal'])
+    if region is not None:
+        df.insert(0, 'Region', region)
+    return df
+
+
+def test_diff_reports_moved_added_and_removed_rows():
+    previous = positions([
+        ('Ann', 'Sue', 1, 120.0, 1000.0),
+        ('Ben', 'Sue', 2, 100.0, 800.0),
+        ('Cal', 'Tom', 3, 90.0, 700.0),
+        ('Dee', 'Tom', 4, 80.0, 600.0),
+    ])
+    current = positions([
+        ('Ben', 'Sue', 1, 125.0, 1100.0),
+        ('Ann', 'Sue', 2, 120.0, 1000.0),
+        ('Dee', 'Tom', 3, 80.0, 600.0),
+        ('Eve', 'Tom', 4, 70.0, 500.0),
+    ])
+    diff = diff_positions(previous, current)
+
+    changed = {row['Consultant Name']: row for row in diff['changed']}
+    assert set(changed) == {'Ann', 'Ben', 'Dee'}
+    assert (changed['Ben']['race_position'], changed['Ben']['race_position_previous']) == (1, 2)
+    assert (changed['Ben']['TotalSalesVal'], changed['Ben']['TotalSalesVal_previous']) == (1100.0, 800.0)
+    assert changed['Dee']['overall_performance'] == changed['Dee']['overall_performance_previous']
+    assert diff['added'] == [{'Consultant Name': 'Eve', 'Supervisor Name': 'Tom', 'race_position': 4,
+                              'overall_performance': 70.0, 'TotalSalesVal': 500.0}]
+    assert diff['removed'] == [{'Consultant Name': 'Cal', 'Supervisor Name': 'Tom'}]
+
+
+def test_diff_without_a_previous_frame_adds_every_row():
+    current = positions([('Ann', 'Sue', 1, 120.0, 1000.0), ('Ben', 'Sue', 2, 100.0, 800.0)])
+    diff = diff_positions(None, current)
+    assert [row['Consultant Name'] for row in diff['added']] == ['Ann', 'Ben']
+    assert diff['changed'] == [] and diff['removed'] == []
+
+
+def test_diff_matches_rows_by_region_too():
+    rows = [('Ann', 'Sue', 1, 120.0, 1000.0)]
+    previous = pd.concat([positions(rows, 'North'), positions(rows, 'South')], ignore_index=True)
+    # Same names, only the southern Ann moved
+    current = previous.copy()
+    current.loc[1, ['race_position', 'TotalSalesVal']] = [2, 900.0]
+    current = pd.concat([current, positions(rows, 'East')], ignore_index=True)
+
+    diff = diff_positions(previous, current, REGION_KEY_COLUMNS)
+    assert [(row['Region'], row['race_position_previous']) for row in diff['changed']] == [('South', 1)]
+    assert [row['Region'] for row in diff['added']] == ['East']
+    assert diff['removed'] == []
+
+
+def test_a_subscriber_that_falls_behind_gets_one_resync_instead_of_a_gap():
+    async def scenario():
+        feed = ChangeFeed(max_pending=3)
+        queue = feed.subscribe()
+        for version in range(1, 6):
+            feed.publish({'data_version': version})
+        await asyncio.sleep(0)
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    # Versions 1-3 filled the queue; 4 found it full and replaced it with RESYNC, which 5 follows
+    assert asyncio.run(scenario()) == [RESYNC, {'data_version': 5}]
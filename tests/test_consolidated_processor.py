@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+import pytest
+
+import utils.consolidated_processor as consolidated_processor
+from utils.consolidated_processor import REGION_COLUMN, ConsolidatedRacingProcessor, find_workbooks
+from utils.race_registry import RaceRegistry
+from utils.utils import write_sample_workbook
+
+# Consultants per regional workbook; different sizes, so the largest-first start order isn't name order
+REGION_SIZES = {'east': 30, 'north': 60, 'south': 45}
+
+
+@pytest.fixture
+def regions_dir(tmp_path):
+    """A directory of regional workbooks, plus an Excel lock file and a non-workbook to skip"""
+    for region, n_consultants in REGION_SIZES.items():
+        races = write_sample_workbook(str(tmp_path / f'{region}.xlsx'), n_consultants, n_supervisors=6,
+                                      seed=n_consultants)
+    (tmp_path / '~$north.xlsx').write_bytes(b'lock')
+    (tmp_path / 'notes.txt').write_text('not a workbook')
+    return tmp_path, RaceRegistry(races)
+
+
+def make_processor(source, registry, max_workers=1):
+    return ConsolidatedRacingProcessor(source, max_workers=max_workers, cache=False, race_registry=registry)
+
+
+def test_find_workbooks_from_a_directory_a_glob_and_a_list(regions_dir):
+    directory, _ = regions_dir
+    expected = [str(directory / f'{region}.xlsx') for region in sorted(REGION_SIZES)]
+
+    assert find_workbooks(str(directory)) == expected
+    assert find_workbooks(str(directory / '*.xlsx')) == expected
+    assert find_workbooks(str(directory / 'n*')) == [str(directory / 'north.xlsx')]
+    # Overlapping items are listed once
+    assert find_workbooks([str(directory / 'south.xlsx'), str(directory)]) == expected
+    assert find_workbooks(str(directory / 'missing.xlsx')) == []
+
+
+def test_regions_are_concatenated_in_file_name_order(regions_dir):
+    processor = make_processor(*regions_dir)
+    raw = processor.load_sales_performance_data()
+
+    assert [os.path.basename(path) for path in processor.workbook_paths] == ['east.xlsx', 'north.xlsx', 'south.xlsx']
+    assert raw[REGION_COLUMN].drop_duplicates().tolist() == ['east', 'north', 'south']
+    assert raw[REGION_COLUMN].value_counts().to_dict() == REGION_SIZES
+
+
+def test_result_does_not_depend_on_which_worker_finishes_first(regions_dir, monkeypatch):
+    directory, registry = regions_dir
+    in_order = make_processor(str(directory), registry, max_workers=2).current_snapshot().processed_data
+
+    # Hand the results over in the reverse of the order they were submitted
+    real_as_completed = consolidated_processor.as_completed
+    monkeypatch.setattr(consolidated_processor, 'as_completed',
+                        lambda futures: reversed(list(real_as_completed(futures))))
+    reversed_order = make_processor(str(directory), registry, max_workers=2).current_snapshot().processed_data
+    pd.testing.assert_frame_equal(reversed_order, in_order)
+
+
+def test_pool_of_two_matches_loading_in_process(regions_dir):
+    directory, registry = regions_dir
+    chunks = []
+    pooled = make_processor(str(directory), registry, max_workers=2)
+    pooled.current_snapshot(on_chunk=chunks.append)
+
+    assert sorted(len(chunk) for chunk in chunks) == sorted(REGION_SIZES.values())
+    in_process = make_processor(str(directory), registry).current_snapshot().processed_data
+    pd.testing.assert_frame_equal(pooled.current_snapshot().processed_data, in_process)
+
+
+def test_same_names_in_two_regions_stay_separate_rows_and_teams(tmp_path):
+    # Two regions whose sheets are identical, names included
+    for region in ('inland', 'coastal'):
+        races = write_sample_workbook(str(tmp_path / f'{region}.xlsx'), 40, n_supervisors=4)
+    processor = make_processor(str(tmp_path), RaceRegistry(races))
+    snapshot = processor.current_snapshot()
+
+    processed = snapshot.processed_data
+    assert len(processed) == 80
+    assert not processed.duplicated(processor.row_key_columns).any()
+    assert processed.duplicated(['Consultant Name', 'Supervisor Name']).sum() == 40
+
+    teams = snapshot.get_team_summary()
+    assert REGION_COLUMN in teams.columns
+    assert len(teams) == 8
+    assert teams.groupby('team_name', observed=True)[REGION_COLUMN].nunique().eq(2).all()
+
+
+def test_region_summary(regions_dir):
+    processor = make_processor(*regions_dir)
+    summary = processor.get_region_summary().set_index(REGION_COLUMN)
+    processed = processor.current_snapshot().processed_data
+
+    assert summary['consultants'].to_dict() == REGION_SIZES
+    for region, rows in processed.groupby(REGION_COLUMN, observed=True):
+        assert summary.loc[region, 'TotalSalesVal'] == pytest.approx(rows['TotalSalesVal'].sum())
+        assert summary.loc[region, 'sales_achievement'] == pytest.approx(
+            rows['TotalSalesVal'].sum() / rows['SalesValTarget'].sum() * 100
+        )
+        assert summary.loc[region, 'avg_performance'] == pytest.approx(rows['overall_performance'].mean())
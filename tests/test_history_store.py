@@ -0,0 +1,42 @@
+from datetime import date
+
+import pandas as pd
+
+from utils.history_store import HistoryStore
+from utils.race_registry import RaceRegistry
+from utils.racing_data_processor import RacingDataProcessor
+from utils.utils import generate_sales_performance_data
+
+
+def test_snapshots_are_recorded_on_their_snapshot_date(tmp_path):
+    raw, races = generate_sales_performance_data(n_consultants=50, n_supervisors=4)
+    processor = RacingDataProcessor('<generated>', cache=False, race_registry=RaceRegistry(races),
+                                    as_of=date(2025, 8, 29))
+    processor.raw_data = raw
+
+    store = HistoryStore(str(tmp_path / 'history.sqlite'))
+    try:
+        store.record_snapshot(processor.current_snapshot())
+        assert store.dates() == ['2025-08-29']
+    finally:
+        store.close()
+
+
+def test_same_names_in_two_regions_are_kept_apart(tmp_path):
+    raw, races = generate_sales_performance_data(n_consultants=40, n_supervisors=4)
+    processor = RacingDataProcessor('<generated>', cache=False, race_registry=RaceRegistry(races))
+    processor.raw_data = raw
+    processed = processor.current_snapshot().processed_data
+    both_regions = pd.concat([processed.assign(region='North'), processed.assign(region='South')])
+
+    store = HistoryStore(str(tmp_path / 'history.sqlite'))
+    try:
+        assert store.record(both_regions, date(2025, 8, 29)) == 80
+        supervisor = processed['Supervisor Name'].iloc[0]
+        assert len(store.consultant_history(processed['Consultant Name'].iloc[0])) == 2
+        north = store.team_trend(supervisor, region='North')
+        total = store.team_trend(supervisor)
+        assert total['sales_actual'].iloc[0] == 2 * north['sales_actual'].iloc[0]
+    finally:
+        store.close()
+
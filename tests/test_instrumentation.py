@@ -0,0 +1,60 @@
+import threading
+import tracemalloc
+
+import pytest
+
+from utils.instrumentation import Instrumentation
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def traced():
+    """Instrumentation tracing memory, recording spans by stage; stops tracemalloc afterwards"""
+    was_tracing = tracemalloc.is_tracing()
+    records = {}
+    yield Instrumentation([lambda record: records.setdefault(record.stage, record)], trace_memory=True), records
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def test_nested_spans_report_their_own_peaks(traced):
+    instrumentation, records = traced
+    with instrumentation.span('outer'):
+        with instrumentation.span('inner'):
+            block = bytearray(4 * MB)
+        del block
+        with instrumentation.span('small'):
+            bytearray(1024)
+
+    assert records['inner'].allocated_bytes >= 4 * MB
+    assert records['small'].allocated_bytes < MB
+    # The outer span still sees the peak its first child reset away from it
+    assert records['outer'].allocated_bytes >= 4 * MB
+    assert not any(record.memory_approximate for record in records.values())
+
+
+def test_overlapping_threads_are_flagged_approximate(traced):
+    instrumentation, records = traced
+    allocated = threading.Event()
+
+    def worker():
+        with instrumentation.span('worker'):
+            block = bytearray(4 * MB)
+            allocated.set()
+            del block
+
+    with instrumentation.span('main'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert allocated.wait(5)
+        thread.join()
+
+    assert records['main'].memory_approximate
+    assert records['worker'].memory_approximate
+    # Exact gauges only: neither span's bytes are attributed to its stage
+    assert instrumentation.stage_stats()['main'].last_allocated_bytes is None
+
+    with instrumentation.span('after'):
+        bytearray(1024)
+    assert records['after'].memory_approximate is False
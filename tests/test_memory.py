@@ -0,0 +1,38 @@
+import gc
+import tracemalloc
+
+from utils.race_registry import RaceRegistry
+from utils.racing_data_processor import RacingDataProcessor
+from utils.utils import generate_sales_performance_data
+
+# A full run peaks at about 1.8x the raw sheet (the cleaned, compacted and
+# ranked frames overlap briefly); copying the consultant table once more
+# than that pushes it past this bound
+MAX_PEAK_TO_RAW_RATIO = 2.5
+
+
+def traced_peak(fn):
+    """Peak bytes allocated (as traced by tracemalloc) while fn runs"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_processing_peak_memory_stays_bounded():
+    raw, races = generate_sales_performance_data(n_consultants=20_000, n_supervisors=18)
+    registry = RaceRegistry(races)
+    raw_bytes = raw.memory_usage(deep=True).sum()
+
+    # One small run first, so one-off lazy initialisation isn't counted
+    warmup = RacingDataProcessor('<generated>', cache=False, race_registry=registry)
+    warmup.raw_data = raw.head(100)
+    warmup.process_for_racing_dashboard()
+
+    processor = RacingDataProcessor('<generated>', cache=False, race_registry=registry)
+    processor.raw_data = raw
+    peak = traced_peak(processor.process_for_racing_dashboard)
+    assert peak < raw_bytes * MAX_PEAK_TO_RAW_RATIO
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils.pace import month_as_of, month_calendar, public_holidays, report_month_start
+
+
+def test_month_calendar_accepts_datetimes_and_timestamps():
+    expected = month_calendar(date(2025, 8, 15))
+    assert month_calendar(datetime(2025, 8, 15, 16, 30)) == expected
+    assert month_calendar(pd.Timestamp('2025-08-15')) == expected
+    assert expected.elapsed_days == 11
+
+
+def test_public_holidays_are_not_business_days():
+    # Freedom Day falls on a Sunday in 2025, so Monday the 28th is off too; Easter is 20 April
+    assert {date(2025, 4, 18), date(2025, 4, 21), date(2025, 4, 27), date(2025, 4, 28)} <= set(public_holidays(2025))
+    assert month_calendar(date(2025, 4, 30)).business_days == 19
+    assert month_calendar(date(2025, 4, 30), holidays=()).business_days == 22
+
+
+def test_christmas_on_a_sunday_moves_past_the_day_of_goodwill():
+    assert date(2022, 12, 27) in public_holidays(2022)
+
+
+def test_report_month_sets_the_snapshot_date():
+    months = pd.Series([202508, '202508', 'Total', None], dtype=object)
+    assert report_month_start(months) == date(2025, 8, 1)
+    assert report_month_start(pd.Series([None, 'Total'])) is None
+
+    assert month_as_of(date(2025, 8, 1), today=date(2025, 8, 20)) == date(2025, 8, 20)
+    assert month_as_of(date(2025, 8, 1), today=date(2025, 9, 3)) == date(2025, 8, 31)
+    assert month_as_of(None, today=date(2025, 9, 3)) == date(2025, 9, 3)
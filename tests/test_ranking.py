@@ -0,0 +1,19 @@
+import numpy as np
+
+from utils.ranking import insert_positions, performance_order
+
+
+def test_insert_positions_place_rows_among_long_ties_like_a_full_sort():
+    rng = np.random.default_rng(7)
+    # Scores on a coarse grid with a long run of zeros, so most rows tie with others
+    scores = np.where(rng.random(5_000) < 0.2, 0.0, rng.integers(0, 40, 5_000) / 4)
+    ranks = rng.permutation(5_000)
+    order = performance_order(scores, ranks)
+
+    new = np.sort(rng.choice(5_000, 300, replace=False))
+    kept = order[~np.isin(order, new)]
+    new = new[performance_order(scores[new], ranks[new])]
+
+    insert_at = insert_positions(scores[kept], ranks[kept], scores[new], ranks[new])
+    assert (np.diff(insert_at) >= 0).all()
+    np.testing.assert_array_equal(np.insert(kept, insert_at, new), order)
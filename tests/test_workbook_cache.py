@@ -0,0 +1,66 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+from utils.workbook_cache import WorkbookCache, workbook_fingerprint
+
+
+def cached_entries(cache_dir):
+    """Every file in the cache directory, leftover temporary files included"""
+    return sorted(os.listdir(cache_dir))
+
+
+def test_a_rewritten_workbook_replaces_its_cached_sheet(tmp_path):
+    workbook = tmp_path / 'sales.xlsx'
+    cache = WorkbookCache(str(tmp_path / 'cache'))
+    other = tmp_path / 'other.xlsx'
+    other.write_bytes(b'other workbook')
+    cache.load(str(other), 'Sheet', lambda: pd.DataFrame({'a': [0]}))
+
+    for version in range(3):
+        workbook.write_bytes(b'version %d' % version)
+        os.utime(workbook, ns=(version * 10 ** 9, version * 10 ** 9))
+        df = cache.load(str(workbook), 'Sheet', lambda: pd.DataFrame({'a': [version]}))
+        assert df['a'].tolist() == [version]
+        # Another projection of the same sheet is a separate entry, not a stale one
+        cache.load(str(workbook), 'Sheet', lambda: pd.DataFrame({'a': [version]}), columns=['a'])
+
+    # One entry per projection of the current version, and the other workbook's
+    assert len(cached_entries(cache.cache_dir)) == 3
+    assert cache.load(str(workbook), 'Sheet', lambda: pd.DataFrame({'a': [-1]}))['a'].tolist() == [2]
+    assert cache.load(str(other), 'Sheet', lambda: pd.DataFrame({'a': [-1]}))['a'].tolist() == [0]
+
+
+def test_threads_storing_the_same_entry_write_separate_files(tmp_path, monkeypatch):
+    from pyarrow import feather
+
+    workbook = tmp_path / 'sales.xlsx'
+    workbook.write_bytes(b'workbook')
+    cache = WorkbookCache(str(tmp_path / 'cache'))
+    df = pd.DataFrame({'a': range(1000)})
+
+    # Hold every writer until all of them are writing, so they overlap
+    n_threads = 4
+    writing = threading.Barrier(n_threads, timeout=10)
+    tmp_paths = []
+    write_feather = feather.write_feather
+
+    def overlapping_write(frame, dest, **kwargs):
+        tmp_paths.append(dest)
+        writing.wait()
+        write_feather(frame, dest, **kwargs)
+
+    monkeypatch.setattr(feather, 'write_feather', overlapping_write)
+    entry = cache.entry_path(workbook_fingerprint(str(workbook)), 'Sheet')
+    threads = [threading.Thread(target=cache.store, args=(entry, df)) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(tmp_paths)) == n_threads
+    assert len(cached_entries(cache.cache_dir)) == 1
+    assert cache.load(str(workbook), 'Sheet', lambda: None).equals(df)
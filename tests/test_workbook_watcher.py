@@ -0,0 +1,25 @@
+import threading
+import time
+
+from utils.workbook_watcher import WorkbookWatcher
+
+
+def test_a_save_is_reloaded_once_within_a_second(tmp_path):
+    path = tmp_path / 'sales.xlsx'
+    path.write_bytes(b'before')
+    reloaded = threading.Event()
+    watcher = WorkbookWatcher(str(path), reloaded.set).start()
+    try:
+        time.sleep(0.3)
+        written = time.monotonic()
+        # A save landing in two writes is still one reload
+        path.write_bytes(b'after, part one')
+        time.sleep(0.05)
+        path.write_bytes(b'after, part one and two')
+
+        assert reloaded.wait(2)
+        assert time.monotonic() - written < 1.0
+        time.sleep(0.6)
+        assert watcher.reloads == 1
+    finally:
+        watcher.stop()